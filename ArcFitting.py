@@ -0,0 +1,148 @@
+"""Fitting of circular arcs to runs of wall centerline points."""
+
+from math import atan2, cos, pi, sin
+
+# A run needs at least this many segments to become an arc, so corners stay corners
+MIN_ARC_SEGMENTS = 4
+# Largest turn between two consecutive segments of an arc, SketchUp circles use 24 sides
+MAX_ARC_TURN = pi / 6
+
+
+def fit_circle(points: list) -> tuple[float, float, float] | None:
+    """
+    Least squares (Kasa) circle through 2D points.
+
+    Returns:
+        tuple | None: (center x, center y, radius), or None for collinear points.
+    """
+
+    import numpy as np
+
+    xy = np.asarray(points, dtype=np.float64)[:, :2]
+    shift = xy.mean(axis=0)  # Center the points for a better conditioned system
+    x, y = (xy - shift).T
+    a = np.column_stack([x, y, np.ones_like(x)])
+    b = x**2 + y**2
+    (cx, cy, c), _, rank, _ = np.linalg.lstsq(a, b, rcond=None)
+    if rank < 3:
+        return None
+
+    cx, cy = cx / 2, cy / 2
+    radius_squared = c + cx**2 + cy**2
+    if radius_squared <= 0:
+        return None
+
+    return float(cx + shift[0]), float(cy + shift[1]), float(radius_squared**0.5)
+
+
+def is_arc(points: list, tol: float) -> tuple | None:
+    """
+    Checks whether a polyline run is a faceted circular arc.
+
+    Every turn must go the same way and stay below MAX_ARC_TURN, and every point must lie
+    within `tol` * radius of the fitted circle.
+
+    Returns:
+        tuple | None: (center x, center y, radius) of the arc, or None.
+    """
+
+    if len(points) < MIN_ARC_SEGMENTS + 1:
+        return None
+
+    turns = []
+    for i in range(1, len(points) - 1):
+        heading_in = atan2(points[i][1] - points[i - 1][1], points[i][0] - points[i - 1][0])
+        heading_out = atan2(points[i + 1][1] - points[i][1], points[i + 1][0] - points[i][0])
+        turns.append((heading_out - heading_in + pi) % (2 * pi) - pi)
+
+    if not (all(turn > 0 for turn in turns) or all(turn < 0 for turn in turns)):
+        return None
+    if max(abs(turn) for turn in turns) > MAX_ARC_TURN:
+        return None
+
+    circle = fit_circle(points)
+    if circle is None:
+        return None
+
+    cx, cy, radius = circle
+    for point in points:
+        distance = ((point[0] - cx) ** 2 + (point[1] - cy) ** 2) ** 0.5
+        if abs(distance - radius) > tol * radius:
+            return None
+
+    return circle
+
+
+def longest_arc(points: list, i: int, tol: float) -> tuple | None:
+    """
+    Finds the longest arc starting at points[i].
+
+    Returns:
+        tuple | None: (index of the arc's last point, (center x, center y, radius)), or None.
+    """
+
+    best = None
+    j = i + MIN_ARC_SEGMENTS
+    while j < len(points):
+        circle = is_arc(points[i : j + 1], tol)
+        if circle is None:
+            break
+        best = (j, circle)
+        j += 1
+
+    return best
+
+
+def fit_arcs(points: list, tol: float = 0.01) -> list[list]:
+    """
+    Splits a centerline polyline into straight segments and circular arcs.
+
+    Runs of points are grown greedily from the start of the polyline; the longest run that
+    passes is_arc() becomes one arc, unless the run starting one point later reaches
+    further. Otherwise a single straight segment is emitted.
+
+    Args:
+        points (list): [x, y] coordinates of the centerline, in order.
+        tol (float): Allowed radial deviation of the points, relative to the radius.
+
+    Returns:
+        list[list]: [start, end] for each straight segment and [start, mid, end] for each
+        arc, where mid is the point of the fitted circle halfway along the arc.
+    """
+
+    segments = []
+    i = 0
+    while i < len(points) - 1:
+        best = longest_arc(points, i, tol)
+
+        # A lead-in segment can pass as the start of a short arc, prefer the longer arc after it
+        if best is not None:
+            following = longest_arc(points, i + 1, tol)
+            if following is not None and following[0] > best[0]:
+                best = None
+
+        if best is None:
+            segments.append([points[i], points[i + 1]])
+            i += 1
+            continue
+
+        j, (cx, cy, radius) = best
+        start_angle = atan2(points[i][1] - cy, points[i][0] - cx)
+        end_angle = atan2(points[j][1] - cy, points[j][0] - cx)
+        second_angle = atan2(points[i + 1][1] - cy, points[i + 1][0] - cx)
+
+        # Sweep in the direction the run travels around the center
+        direction = 1 if (second_angle - start_angle) % (2 * pi) < pi else -1
+        sweep = ((end_angle - start_angle) * direction) % (2 * pi)
+        mid_angle = start_angle + direction * sweep / 2
+
+        segments.append(
+            [
+                points[i],
+                (cx + radius * cos(mid_angle), cy + radius * sin(mid_angle)),
+                points[j],
+            ]
+        )
+        i = j
+
+    return segments
@@ -0,0 +1,178 @@
+"""Checkpoints that let an interrupted conversion run resume where it stopped."""
+
+import json
+import os
+from time import perf_counter
+
+# Bump when the stored records change shape, so old checkpoints are not resumed
+CHECKPOINT_FORMAT = 2
+
+
+class ConversionCheckpoint:
+    """
+    Persists the converted records of a run and its position in the element stream.
+
+    Checkpoints live in `<directory>/<key>/`, where the key hashes the source version id,
+    the function inputs and CHECKPOINT_FORMAT, so a rerun with different inputs (e.g. a
+    new tolerance or reference level) never resumes from stale records. Each converted
+    element is appended to `records.ndjson`; `state.json` holds the position up to which
+    the records are complete and is only replaced (atomically) after they were synced.
+
+    Args:
+        directory (str): Root directory for all checkpoints.
+        version_id (str): Id of the source version being converted.
+        inputs (dict): Function inputs that affect the converted records.
+        interval (float): Minimum seconds between two saves.
+    """
+
+    def __init__(
+        self, directory: str, version_id: str, inputs: dict, interval: float = 30.0
+    ) -> None:
+        from hashlib import sha256
+        from pathlib import Path
+
+        self.key = sha256(
+            json.dumps(
+                [CHECKPOINT_FORMAT, version_id, inputs], sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()[:32]
+        self.path = Path(directory) / self.key
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.path / "records.ndjson"
+        self.state_path = self.path / "state.json"
+
+        self.version_id = version_id
+        self.inputs = inputs
+        self.interval = interval
+        self.position = 0
+
+        self._records = None
+        self._last_save = perf_counter()
+
+    def load(self, elements: list | None = None) -> tuple[int, list[dict]]:
+        """
+        Reads the last checkpoint.
+
+        Positions index into the element list of the run, so with `elements` given every
+        stored record must still belong to the element at its position. Otherwise the
+        checkpoint is discarded and the run starts over.
+
+        Args:
+            elements (list | None): Serialized elements of the run, in stream order.
+
+        Returns:
+            tuple: (position to resume from, stored element records in stream order).
+        """
+
+        position = 0
+        if self.state_path.exists():
+            with open(self.state_path, encoding="utf-8") as file:
+                position = json.load(file)["position"]
+
+        entries = []
+        if self.records_path.exists():
+            with open(self.records_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:  # Torn write from a killed run
+                        break
+                    if entry["position"] < position:
+                        entries.append(entry)
+
+        if elements is not None and (
+            position > len(elements)
+            or any(
+                elements[entry["position"]]["id"] != entry["source_id"]
+                for entry in entries
+            )
+        ):
+            position, entries = 0, []
+            self.state_path.unlink(missing_ok=True)
+
+        # Drop records written after the last save, they are converted again
+        with open(self.records_path, "w", encoding="utf-8") as file:
+            for entry in entries:
+                file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+        self.position = position
+        return position, entries
+
+    def add(
+        self,
+        position: int,
+        source_id: str,
+        walls: list[dict],
+        columns: list[dict],
+        degraded: bool = False,
+        errors: list[dict] | None = None,
+        vertex_count: int = 0,
+        duration: float = 0.0,
+    ) -> None:
+        """
+        Appends the records converted from the element at `position`, with the outcome of
+        its conversion (degraded, errors, vertex count and seconds), so a resumed run
+        reports restored elements like the ones it converts itself.
+        """
+
+        if self._records is None:
+            self._records = open(self.records_path, "a", encoding="utf-8")
+        self._records.write(
+            json.dumps(
+                {
+                    "position": position,
+                    "source_id": source_id,
+                    "walls": walls,
+                    "columns": columns,
+                    "degraded": degraded,
+                    "errors": errors or [],
+                    "vertex_count": vertex_count,
+                    "duration": duration,
+                },
+                separators=(",", ":"),
+                default=str,  # Errors can hold geometry objects
+            )
+            + "\n"
+        )
+
+    def maybe_save(self, position: int) -> None:
+        """Saves if at least `interval` seconds passed since the last save."""
+
+        if perf_counter() - self._last_save >= self.interval:
+            self.save(position)
+
+    def save(self, position: int) -> None:
+        """Marks every element before `position` as converted."""
+
+        if self._records is not None:
+            self._records.flush()
+            os.fsync(self._records.fileno())
+
+        temporary_path = self.state_path.with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "format": CHECKPOINT_FORMAT,
+                    "version_id": self.version_id,
+                    "inputs": self.inputs,
+                    "position": position,
+                },
+                file,
+                default=str,
+            )
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.state_path)
+
+        self.position = position
+        self._last_save = perf_counter()
+
+    def clear(self) -> None:
+        """Deletes the checkpoint, once its run has completed."""
+
+        from shutil import rmtree
+
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+        rmtree(self.path, ignore_errors=True)
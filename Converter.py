@@ -0,0 +1,281 @@
+"""Conversion of single SketchUp DirectShapes into Revit wall and column data."""
+
+from time import perf_counter
+
+# Imported with the module rather than on first use, so the first converted element of a
+# run or worker is not timed together with the imports (pygeoops alone takes ~0.5 s)
+from pygeoops import centerline
+from shapely import concave_hull, force_2d
+from shapely.geometry.polygon import Polygon
+
+from ArcFitting import fit_arcs
+from Preflight import element_cost
+from RevitColumn import revit_column_data
+from RevitWall import remove_duplicate_points, revit_wall_data
+from Speckle_SketchUp_mapper import mapping_categories
+from Watchdog import ElementTimeoutError, long_axis_baseline, time_budget
+
+DEFAULT_WALL_TYPE = "Wall-Int_12P-100Blk-12P"
+DEFAULT_COLUMN_TYPE = "450x450mm"
+
+
+def has_type_name(element: dict) -> bool:
+    """Whether the SketchUp mapper 'Name' field holds a Revit type name."""
+
+    return (
+        "name" in element
+        and (element["name"] != "<Mixed>" or not str(element["name"]).isspace())
+        and element["name"] != ""
+    )
+
+
+def sorted_vertices(vertices, tol: float) -> list[list[float]]:
+    """Removes duplicate vertices from an (n, 3) array and sorts them by z-coordinate."""
+
+    vertices = remove_duplicate_points(vertices, tol)
+    return vertices[vertices[:, 2].argsort(kind="stable")].tolist()
+
+
+def convert_wall(element: dict, vertices, function_inputs) -> dict:
+    """
+    Converts a SketchUp wall to one Revit wall per straight segment of its centerline.
+
+    Args:
+        element (dict): Serialized DirectShape, its "baseGeometries" are not used.
+        vertices: (n, 3) array or view of the wall mesh vertices.
+        function_inputs (FunctionInputs): Inputs of the run.
+
+    Returns:
+        dict: "walls" and "errors" lists, and whether the element was "degraded".
+    """
+
+    tol = function_inputs.tolerance
+    budget = function_inputs.element_time_budget
+    start = perf_counter()
+    walls = []
+    errors = []
+    degraded = ""
+    vertex_count = len(vertices)
+
+    # Getting the coordinates of the vertices
+    vertices = sorted_vertices(vertices, tol)
+
+    base_polygon = []
+    for vertex in vertices:  # Only get the base polygon of the wall
+        if vertex[2] > vertices[0][2] - tol and vertex[2] < vertices[-1][2] + tol:
+            base_polygon.append(vertex[0:2])
+
+    # Get the centerline of the polygon to use as the baseLine
+    try:
+        base_points = base_polygon
+        try:
+            # The alarm cannot interrupt a running GEOS call, so do not start one that is
+            # predicted to outlast the budget
+            if budget and element_cost("Walls", vertex_count) > budget:
+                raise ElementTimeoutError("Predicted to exceed the time budget.")
+
+            with time_budget(budget):
+                base_polygon = concave_hull(Polygon(base_polygon))
+
+                baseLine_raw = centerline(base_polygon, extend=True)
+        except ElementTimeoutError:
+            # Pathological mesh, use a cheap approximation instead
+            baseLine_raw = long_axis_baseline(base_points)
+            degraded = "baseline approximated by the long axis of the footprint"
+
+        baseLine_cooked = list(baseLine_raw.coords)  # type: ignore
+
+        # Split the baseLine into straight line segments, and arcs if enabled, for Revit
+        baseLines = [
+            [baseLine_cooked[segment], baseLine_cooked[segment + 1]]
+            for segment in range(len(baseLine_cooked) - 1)
+        ]
+        if function_inputs.fit_arcs and not degraded:
+            try:
+                # Arc fitting shares what is left of the element's budget
+                with time_budget(
+                    max(budget - (perf_counter() - start), 1e-3) if budget else 0
+                ):
+                    baseLines = fit_arcs(baseLine_cooked, function_inputs.arc_tolerance)
+            except ElementTimeoutError:
+                degraded = "arcs not fitted, straight segments kept"
+
+        is_degraded = f"DEGRADED, {degraded}. " if degraded else ""
+
+        for baseLine in baseLines:  # Loop for multiple baseLines, [start, end] or [start, mid, end]
+
+            # Add the Revit formatted data to the walls list
+            walls.append(
+                revit_wall_data(
+                    units=element["units"],
+                    baseLine_start=[baseLine[0][0], baseLine[0][1], vertices[0][2]],
+                    baseLine_end=[baseLine[-1][0], baseLine[-1][1], vertices[0][2]],
+                    baseLine_mid=(  # Arcs carry a third point halfway along
+                        [baseLine[1][0], baseLine[1][1], vertices[0][2]]
+                        if len(baseLine) == 3
+                        else None
+                    ),
+                    baseLine_length=baseLine_raw.length,  # type: ignore
+                    baseOffset=vertices[0][2],
+                    height=vertices[-1][2] - vertices[0][2],
+                    type=(  # Use default value if name is not provided
+                        element["name"] if has_type_name(element) else DEFAULT_WALL_TYPE
+                    ),
+                    level_name=function_inputs.reference_level,
+                    comment=(
+                        f"[Speckle Automate]: {is_degraded}Type specified."
+                        if has_type_name(element)
+                        else f"[Speckle Automate]: {is_degraded}Type not specified, default used."
+                    ),
+                )
+            )
+    except Exception as e:
+        from traceback import format_exc
+
+        errors.append(
+            {
+                "Error": "There was an error while creating the Revit data.",
+                "Element": element,
+                "Error Message": f"{e}",
+                "Traceback": str(format_exc()),
+                "Base Polygon": base_polygon,
+            }
+        )
+
+    return {"walls": walls, "errors": errors, "degraded": bool(degraded)}
+
+
+def convert_column(element: dict, vertices, function_inputs) -> dict:
+    """
+    Converts a SketchUp column to a Revit column between its bottom and top centroids.
+
+    Args:
+        element (dict): Serialized DirectShape, its "baseGeometries" are not used.
+        vertices: (n, 3) array or view of the column mesh vertices.
+        function_inputs (FunctionInputs): Inputs of the run.
+
+    Returns:
+        dict: "columns" and "errors" lists.
+    """
+
+    tol = function_inputs.tolerance
+    columns = []
+    errors = []
+
+    # Get and sort the vertices by z-coordinate
+    vertices = sorted_vertices(vertices, tol)
+
+    try:
+        # Get center points / baseLine points from top and bottom polygons
+        bottom_polygon = Polygon(
+            [
+                vertex
+                for vertex in vertices
+                if vertex[2] > vertices[0][2] - tol and vertex[2] < vertices[0][2] + tol
+            ]
+        ).convex_hull
+        top_polygon = Polygon(
+            [
+                vertex
+                for vertex in vertices
+                if vertex[2] > vertices[-1][2] - tol
+                and vertex[2] < vertices[-1][2] + tol
+            ]
+        ).convex_hull
+
+        if len(bottom_polygon.boundary.coords) > 5:
+            is_placeholder = "PLACEHOLDER, this column is not rectangular. "
+        else:
+            is_placeholder = ""
+
+        baseLine_start = list(bottom_polygon.centroid.coords[0])
+        baseLine_end = list(top_polygon.centroid.coords[0])
+
+        columns.append(
+            revit_column_data(
+                units=element["units"],
+                baseLine_start=baseLine_start + [vertices[0][2]],
+                baseLine_end=baseLine_end + [vertices[-1][2]],
+                baseLine_length=vertices[-1][2] - vertices[0][2],
+                baseOffset=vertices[0][2],
+                type=(  # Use default value if name is not provided
+                    element["name"] if has_type_name(element) else DEFAULT_COLUMN_TYPE
+                ),
+                level_name=function_inputs.reference_level,
+                isSlanted=(  # Check if the column is vertically slanted
+                    not force_2d(bottom_polygon).equals_exact(force_2d(top_polygon), tol)
+                ),
+                comment=(
+                    f"[Speckle Automate]: {is_placeholder}Type specified."
+                    if has_type_name(element)
+                    else f"[Speckle Automate]: {is_placeholder}Type not specified, default used."
+                ),
+            )
+        )
+
+    except Exception as e:
+        from traceback import format_exc
+
+        errors.append(
+            {
+                "Error": "There was an error while creating the Revit data.",
+                "Element": element,
+                "Error Message": f"{e}",
+                "Traceback": str(format_exc()),
+                "Vertices": vertices,
+            }
+        )
+
+    return {"columns": columns, "errors": errors}
+
+
+def convert_element(element: dict, vertices, function_inputs) -> dict:
+    """
+    Converts one DirectShape according to its mapped category.
+
+    Args:
+        element (dict): Serialized DirectShape, its "baseGeometries" are not used.
+        vertices: (n, 3) array or view of the element's first mesh vertices.
+        function_inputs (FunctionInputs): Inputs of the run.
+
+    Returns:
+        dict: "walls", "columns" and "errors" lists, whether the element was "degraded",
+        its "vertex_count" and the "duration" of the conversion in seconds.
+    """
+
+    element_start = perf_counter()
+    result = {"walls": [], "columns": [], "errors": [], "degraded": False}
+
+    match mapping_categories[element["category"]]:  # switch for different types of elements
+
+        case "Walls":
+            result.update(convert_wall(element, vertices, function_inputs))
+
+        case "Columns" | "StructuralColumns":
+            result.update(convert_column(element, vertices, function_inputs))
+
+        case _:
+            pass
+
+    result["vertex_count"] = len(vertices)
+    result["duration"] = perf_counter() - element_start
+
+    return result
+
+
+# Vertex store attached by every worker process, see init_worker()
+_worker_store = None
+
+
+def init_worker(store) -> None:
+    """ProcessPoolExecutor initializer, attaches the shared VertexStore once per worker."""
+
+    global _worker_store
+    _worker_store = store
+
+
+def convert_stored_element(task: tuple) -> dict:
+    """Worker entry point, converts (element header, store slot, function inputs)."""
+
+    element, slot, function_inputs = task
+    return convert_element(element, _worker_store.vertices(slot), function_inputs)
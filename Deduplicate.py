@@ -0,0 +1,162 @@
+"""Model-wide elimination of duplicated and overlapping SketchUp elements."""
+
+
+def element_footprint(element: dict, tol: float = 1e-6):
+    """
+    Projects every face of an element's meshes onto the XY plane and unions them.
+
+    Args:
+        element (dict): Serialized DirectShape with meshes in "baseGeometries".
+        tol (float): Tolerance used to snap the footprint to a grid.
+
+    Returns:
+        tuple: (footprint polygon, minimum z, maximum z).
+    """
+
+    import numpy as np
+    import shapely
+
+    rings = {}  # Vertex count -> projected face rings
+    z_values = []
+    for mesh in element["baseGeometries"]:
+        vertices = np.asarray(mesh["vertices"], dtype=float).reshape(-1, 3)
+        z_values.append(vertices[:, 2])
+
+        faces = mesh.get("faces") or []
+        i = 0
+        while i < len(faces):
+            # Speckle face encoding: vertex count, then indices. 0 and 1 are legacy triangle/quad flags
+            n = faces[i] + 3 if faces[i] < 3 else faces[i]
+            rings.setdefault(n, []).append(vertices[faces[i + 1 : i + 1 + n], :2])
+            i += n + 1
+
+    z_values = np.concatenate(z_values)
+
+    # One polygon per face ring, n-gons do not have to be star-shaped, so they are not
+    # triangulated. make_valid() splits self-intersecting rings.
+    polygons = []
+    for n, face_rings in rings.items():
+        if n >= 3:
+            polygons.extend(
+                shapely.make_valid(shapely.polygons(np.asarray(face_rings)))
+            )
+    polygons = [p for p in polygons if p.area > tol * tol]  # Drop vertical faces
+    if polygons:
+        footprint = shapely.union_all(polygons, grid_size=tol or None)
+    else:  # No horizontal faces to project, fall back to the outline of the points
+        footprint = shapely.MultiPoint(
+            np.concatenate(
+                [
+                    np.asarray(mesh["vertices"], dtype=float).reshape(-1, 3)[:, :2]
+                    for mesh in element["baseGeometries"]
+                ]
+            )
+        ).convex_hull
+
+    return footprint, float(z_values.min()), float(z_values.max())
+
+
+def drop_duplicate_elements(
+    elements: list, tol: float = 1e-6, overlap_threshold: float = 0.95
+) -> tuple[list, list[dict]]:
+    """
+    Keeps one representative of every group of duplicated or overlapping elements.
+
+    Only DirectShapes that get converted (see is_convertible()) are compared, and only
+    against elements of the same category. Exact duplicates share a footprint and height after snapping to
+    `tol`. Near-total overlaps are found with an STRtree over the footprints: both the
+    shared footprint area and the shared height must be at least `overlap_threshold` of
+    the larger element's. The first element in model order is kept.
+
+    Args:
+        elements (list): Serialized elements of the SketchUp model.
+        tol (float): Tolerance used to compare coordinates.
+        overlap_threshold (float): Fraction of area and height two elements must share.
+
+    Returns:
+        tuple: (kept elements in their original order, dropped element records).
+    """
+
+    import shapely
+    from shapely.strtree import STRtree
+    from Speckle_SketchUp_mapper import is_convertible
+
+    # The same predicate as the conversion tasks, elements without vertices are skipped
+    candidates = [
+        index for index, element in enumerate(elements) if is_convertible(element)
+    ]
+
+    footprints = []
+    heights = []
+    for index in candidates:
+        footprint, z_min, z_max = element_footprint(elements[index], tol)
+        footprints.append(footprint)
+        heights.append((z_min, z_max))
+
+    dropped = {}  # Position in candidates -> drop record
+
+    # Exact duplicates, hashed on category, snapped heights and normalized footprint
+    seen = {}
+    for position, index in enumerate(candidates):
+        z_min, z_max = heights[position]
+        key = (
+            elements[index]["category"],
+            round(z_min / tol) if tol else z_min,
+            round(z_max / tol) if tol else z_max,
+            shapely.normalize(
+                shapely.set_precision(footprints[position], tol)
+            ).wkb,
+        )
+        if key in seen:
+            dropped[position] = {
+                "id": elements[index]["id"],
+                "kept_id": elements[candidates[seen[key]]]["id"],
+                "reason": "duplicate",
+                "overlap": 1.0,
+            }
+        else:
+            seen[key] = position
+
+    # Near-total overlaps between the remaining elements
+    tree = STRtree(footprints)
+    for position, index in enumerate(candidates):
+        if position in dropped or footprints[position].area <= 0:
+            continue
+
+        for other in sorted(tree.query(footprints[position], predicate="intersects")):
+            other = int(other)
+            if other <= position or other in dropped:
+                continue
+            if elements[candidates[other]]["category"] != elements[index]["category"]:
+                continue
+
+            z_min = max(heights[position][0], heights[other][0])
+            z_max = min(heights[position][1], heights[other][1])
+            tallest = max(
+                heights[position][1] - heights[position][0],
+                heights[other][1] - heights[other][0],
+            )
+            height_overlap = (z_max - z_min) / tallest if tallest > 0 else 1.0
+            if height_overlap < overlap_threshold:
+                continue
+
+            largest = max(footprints[position].area, footprints[other].area)
+            area_overlap = (
+                footprints[position].intersection(footprints[other]).area / largest
+            )
+            if area_overlap < overlap_threshold:
+                continue
+
+            dropped[other] = {
+                "id": elements[candidates[other]]["id"],
+                "kept_id": elements[index]["id"],
+                "reason": "overlap",
+                "overlap": min(area_overlap, height_overlap),
+            }
+
+    dropped_indices = {candidates[position] for position in dropped}
+    kept = [
+        element for index, element in enumerate(elements) if index not in dropped_indices
+    ]
+
+    return kept, [dropped[position] for position in sorted(dropped)]
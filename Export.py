@@ -0,0 +1,126 @@
+"""Streaming NDJSON and columnar NumPy export of the converted Revit elements."""
+
+import json
+
+
+class ElementExporter:
+    """
+    Writes converted elements to `<path>.ndjson` as they are created, and to a columnar
+    `<path>.npz` table when closed.
+
+    The NDJSON file holds one {"source_id": ..., "data": <revit_*_data() dict>} object per
+    line and is flushed every `flush_every` elements, so a partial run leaves a readable
+    file behind. The table holds one row per element:
+
+        source_id, id - [str] SketchUp element id / Revit element id.
+        start, end - [n, 3] baseline end points.
+        height - wall height, or the vertical extent of the column baseline.
+        offset - base offset.
+        type_index - index into the "types" array.
+        category_index - index into the "categories" array.
+        slanted - whether the column is slanted (always False for walls).
+        rotation - column rotation in degrees (always 0 for walls).
+        curved - whether the baseline is an arc (curved walls).
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1000) -> None:
+        from pathlib import Path
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ndjson_path = self.path.with_suffix(".ndjson")
+        self.npz_path = self.path.with_suffix(".npz")
+        self.flush_every = flush_every
+
+        self._file = open(self.ndjson_path, "w", encoding="utf-8")
+        self._rows = []
+        self._types = {}
+        self._categories = {}
+
+    def write(self, record: dict, source_id: str | None = None) -> None:
+        """Appends one revit_wall_data() or revit_column_data() dict to the export."""
+
+        self._file.write(
+            json.dumps({"source_id": source_id, "data": record}, separators=(",", ":"))
+            + "\n"
+        )
+
+        # Lines have start/end, arcs (curved walls) have startPoint/endPoint
+        baseLine = record["baseLine"]
+        start = baseLine.get("start") or baseLine["startPoint"]
+        end = baseLine.get("end") or baseLine["endPoint"]
+        self._rows.append(
+            (
+                source_id or "",
+                record["id"],
+                start["x"],
+                start["y"],
+                start["z"],
+                end["x"],
+                end["y"],
+                end["z"],
+                record.get("height", end["z"] - start["z"]),
+                record["baseOffset"],
+                self._types.setdefault(record["type"], len(self._types)),
+                self._categories.setdefault(record["category"], len(self._categories)),
+                record.get("isSlanted", False),
+                record.get("rotation", 0.0),
+                baseLine["speckle_type"] == "Objects.Geometry.Arc",
+            )
+        )
+
+        if len(self._rows) % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        import numpy as np
+
+        if self._file.closed:
+            return
+        self._file.close()
+
+        rows = self._rows
+        columns = list(zip(*rows)) if rows else [()] * 15
+        np.savez(
+            self.npz_path,
+            source_id=np.array(columns[0], dtype=str),
+            id=np.array(columns[1], dtype=str),
+            start=np.array(columns[2:5], dtype=np.float64).T.reshape(-1, 3),
+            end=np.array(columns[5:8], dtype=np.float64).T.reshape(-1, 3),
+            height=np.array(columns[8], dtype=np.float64),
+            offset=np.array(columns[9], dtype=np.float64),
+            type_index=np.array(columns[10], dtype=np.int32),
+            category_index=np.array(columns[11], dtype=np.int8),
+            slanted=np.array(columns[12], dtype=bool),
+            rotation=np.array(columns[13], dtype=np.float64),
+            curved=np.array(columns[14], dtype=bool),
+            types=np.array(list(self._types), dtype=str),
+            categories=np.array(list(self._categories), dtype=str),
+        )
+
+    def __enter__(self) -> "ElementExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def iter_ndjson(path: str):
+    """Yields the (source_id, element dict) pairs of an NDJSON export one at a time."""
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                row = json.loads(line)
+                yield row["source_id"], row["data"]
+
+
+def load_columns(path: str) -> dict:
+    """Loads a columnar .npz export into a dict of NumPy arrays."""
+
+    import numpy as np
+
+    with np.load(path) as table:
+        return {name: table[name] for name in table.files}
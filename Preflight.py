@@ -0,0 +1,253 @@
+"""Preflight cost estimation and execution planning for a conversion run."""
+
+import os
+from math import ceil
+
+# Seconds to convert one element of n vertices: intercept + linear * n + quadratic * n**2.
+# Measured with Converter.convert_element() on faceted walls and columns. With a telemetry
+# store, runs use calibrate_cost_model() on the element timings of earlier runs instead.
+COST_MODEL = {
+    "Walls": {"intercept": 4e-3, "linear": 2e-5, "quadratic": 1.1e-7},
+    "Columns": {"intercept": 4e-4, "linear": 6e-7, "quadratic": 1.5e-9},
+    "StructuralColumns": {"intercept": 4e-4, "linear": 6e-7, "quadratic": 1.5e-9},
+}
+
+# Resident memory of a received element: the Base object, its serialized dict and the
+# converted records (per element), and the vertex and face lists held twice (per vertex)
+MEMORY_PER_ELEMENT = 10_000
+MEMORY_PER_VERTEX = 400
+MEMORY_BASELINE = 150_000_000  # Interpreter, specklepy, shapely and numpy
+
+# Predicted conversion seconds above which elements are converted in parallel
+PARALLEL_THRESHOLD = 30.0
+# Target seconds of work per worker task, sets the executor chunk size
+CHUNK_SECONDS = 1.0
+# Share of the available memory a run may use before geometry moves to the vertex store
+MEMORY_SHARE = 0.5
+
+
+def element_cost(category: str, vertex_count: int, cost_model: dict = COST_MODEL) -> float:
+    """Predicted seconds to convert one element, 0 for categories without a converter."""
+
+    if category not in cost_model:
+        return 0.0
+    coefficients = cost_model[category]
+    return (
+        coefficients["intercept"]
+        + coefficients["linear"] * vertex_count
+        + coefficients["quadratic"] * vertex_count**2
+    )
+
+
+def field(obj, name: str, default=None):
+    """Reads `name` from a serialized dict or a received specklepy Base object."""
+
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def scan_elements(elements: list, cost_model: dict = COST_MODEL) -> dict:
+    """
+    Counts elements and vertices per mapped category and predicts their cost, without
+    touching the geometry beyond the length of the vertex lists.
+
+    Args:
+        elements (list): Serialized elements, or the received Base objects, so a run can
+            be scanned before it is parsed.
+        cost_model (dict): Coefficients per category, see COST_MODEL.
+
+    Returns:
+        dict: Mapped category -> {"elements", "vertices", "max_vertices", "seconds"}.
+    """
+
+    from Speckle_SketchUp_mapper import mapping_categories
+
+    scan = {}
+    for element in elements:
+        if field(element, "speckle_type") != "Objects.BuiltElements.Revit.DirectShape":
+            continue
+
+        category = mapping_categories.get(field(element, "category"), "Unknown")
+        meshes = field(element, "baseGeometries") or []
+        vertex_count = len(field(meshes[0], "vertices")) // 3 if meshes else 0
+        total_vertices = sum(len(field(mesh, "vertices")) // 3 for mesh in meshes)
+
+        entry = scan.setdefault(
+            category, {"elements": 0, "vertices": 0, "max_vertices": 0, "seconds": 0.0}
+        )
+        entry["elements"] += 1
+        entry["vertices"] += total_vertices
+        entry["max_vertices"] = max(entry["max_vertices"], vertex_count)
+        entry["seconds"] += element_cost(category, vertex_count, cost_model)
+
+    return scan
+
+
+def available_memory() -> int | None:
+    """Memory limit of the container, or the physical memory of the machine, in bytes."""
+
+    try:
+        with open("/sys/fs/cgroup/memory.max") as file:
+            limit = file.read().strip()
+        if limit != "max":
+            return int(limit)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may use: its CPU affinity, capped by the container's cgroup CPU
+    quota. os.cpu_count() reports the CPUs of the host instead.
+    """
+
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS and Windows
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return cpus
+
+
+def plan_run(scan: dict, max_workers: int | None = None) -> dict:
+    """
+    Picks the execution strategy for a scanned model.
+
+    Args:
+        scan (dict): Output of scan_elements().
+        max_workers (int | None): Upper limit for the worker count, never above
+            available_cpus(). Defaults to available_cpus().
+
+    Returns:
+        dict: Predicted "seconds" (wall clock with the chosen workers), "serial_seconds",
+        "memory_bytes" and "available_memory", and the strategy: "workers",
+        "vertex_store" (geometry streamed through the memory-mapped store instead of
+        Python lists) and "chunk_size" per worker task, with the "reasons" for it.
+    """
+
+    from Speckle_SketchUp_mapper import converted_categories
+
+    converted = [scan[c] for c in scan if c in converted_categories]
+    element_count = sum(entry["elements"] for entry in converted)
+    serial_seconds = sum(entry["seconds"] for entry in converted)
+    memory_bytes = (
+        MEMORY_BASELINE
+        + MEMORY_PER_ELEMENT * sum(entry["elements"] for entry in scan.values())
+        + MEMORY_PER_VERTEX * sum(entry["vertices"] for entry in scan.values())
+    )
+    memory_limit = available_memory()
+    cpus = available_cpus()
+    max_workers = min(max_workers, cpus) if max_workers else cpus
+
+    reasons = []
+    workers = 1
+    if serial_seconds > PARALLEL_THRESHOLD and max_workers > 1:
+        workers = min(max_workers, ceil(serial_seconds / PARALLEL_THRESHOLD))
+        reasons.append(
+            f"{serial_seconds:.0f} s of serial work is above {PARALLEL_THRESHOLD:.0f} s, "
+            f"using {workers} workers"
+        )
+    else:
+        reasons.append("serial conversion is fast enough")
+
+    vertex_store = workers > 1
+    if memory_limit and memory_bytes > MEMORY_SHARE * memory_limit:
+        vertex_store = True
+        reasons.append(
+            f"{memory_bytes / 1e6:.0f} MB projected is above {MEMORY_SHARE:.0%} of the "
+            f"{memory_limit / 1e6:.0f} MB available, streaming geometry through the vertex store"
+        )
+
+    mean_seconds = serial_seconds / element_count if element_count else 0.0
+    chunk_size = max(
+        1,
+        min(
+            int(CHUNK_SECONDS / mean_seconds) if mean_seconds else 1,
+            element_count // (workers * 4) or 1,
+        ),
+    )
+
+    return {
+        "elements": element_count,
+        "serial_seconds": serial_seconds,
+        # Workers do not scale perfectly, count on 85% efficiency
+        "seconds": serial_seconds if workers == 1 else serial_seconds / (workers * 0.85),
+        "memory_bytes": memory_bytes,
+        "available_memory": memory_limit,
+        "workers": workers,
+        "vertex_store": vertex_store,
+        "chunk_size": chunk_size,
+        "reasons": reasons,
+    }
+
+
+def plan_report(scan: dict, plan: dict) -> str:
+    """Human readable preflight summary, for the run status message."""
+
+    lines = ["Preflight plan:"]
+    for category, entry in sorted(scan.items(), key=lambda item: -item[1]["seconds"]):
+        lines.append(
+            f"  {category}: {entry['elements']} element(s), {entry['vertices']} vertices "
+            f"(max {entry['max_vertices']}), ~{entry['seconds']:.1f} s"
+        )
+    lines.append(
+        f"  Predicted: {plan['seconds']:.1f} s ({plan['serial_seconds']:.1f} s serial), "
+        f"{plan['memory_bytes'] / 1e6:.0f} MB peak memory"
+    )
+    lines.append(
+        f"  Strategy: {plan['workers']} worker(s), "
+        + ("streaming through the vertex store" if plan["vertex_store"] else "in-memory")
+        + f", chunk size {plan['chunk_size']}"
+    )
+    lines.extend(f"    - {reason}" for reason in plan["reasons"])
+
+    return "\n".join(lines)
+
+
+def calibrate_cost_model(records: list[dict], cost_model: dict = COST_MODEL) -> dict:
+    """
+    Refits the per-category cost coefficients to measured element timings.
+
+    Args:
+        records (list[dict]): ElementTimings.records of one or more runs.
+        cost_model (dict): Coefficients kept for categories with too few records.
+
+    Returns:
+        dict: New cost model, coefficients are clamped to be non-negative.
+    """
+
+    import numpy as np
+
+    calibrated = {category: dict(c) for category, c in cost_model.items()}
+    by_category = {}
+    for record in records:
+        by_category.setdefault(record["category"], []).append(record)
+
+    for category, category_records in by_category.items():
+        if category not in calibrated or len(category_records) < 3:
+            continue
+        n = np.array([r["vertex_count"] for r in category_records], dtype=np.float64)
+        seconds = np.array([r["duration"] for r in category_records], dtype=np.float64)
+        a = np.column_stack([np.ones_like(n), n, n**2])
+        (intercept, linear, quadratic), *_ = np.linalg.lstsq(a, seconds, rcond=None)
+        calibrated[category] = {
+            "intercept": max(float(intercept), 0.0),
+            "linear": max(float(linear), 0.0),
+            "quadratic": max(float(quadratic), 0.0),
+        }
+
+    return calibrated
@@ -16,6 +16,7 @@ def revit_wall_data(
     phaseCreated="New Construction",
     structural=False,
     comment: str | None = None,
+    baseLine_mid: list[float] | None = None,
 ) -> dict:
     """
     Formats the input data so it can be pushed to Speckle and received as a native Revit wall.
@@ -29,6 +30,8 @@ def revit_wall_data(
             start - [x,y,z] coordinates of the start of the baseline.
             end - [x,y,z] coordinates of the end of the baseline.
             length - [num] length of the baseline.
+            mid - [x,y,z] coordinates of a point halfway along the baseline. If given, the
+                baseline is the horizontal arc through start, mid and end (a curved wall).
 
         baseOffset - [num] offset relative to the assigned level.
         family - [str] name of the wall family.
@@ -148,9 +151,134 @@ def revit_wall_data(
         },
     }
 
+    if baseLine_mid is not None:
+        outputDict["baseLine"] = arc_data(
+            start=baseLine_start,
+            mid=baseLine_mid,
+            end=baseLine_end,
+            units=units,
+            domain_start=baseLine_domain_start,
+            domain_end=baseLine_domain_end,
+        )
+
     return outputDict
 
 
+def arc_data(
+    start: list[float],
+    mid: list[float],
+    end: list[float],
+    units="mm",
+    domain_start=0.0,
+    domain_end=0.0,
+) -> dict:
+    """
+    Formats a horizontal arc through three points as an Objects.Geometry.Arc.
+
+    INPUTS:
+
+        start - [x,y,z] coordinates of the start of the arc.
+        mid - [x,y,z] coordinates of a point on the arc between start and end.
+        end - [x,y,z] coordinates of the end of the arc.
+        units - Self explanatory.
+        domain start/end - Same as for the wall baseLine.
+
+    The arc lies in the horizontal plane at the start point's z. Its plane normal points up
+    for counter-clockwise arcs and down for clockwise ones, so angles always increase from
+    start to end.
+    """
+
+    from math import atan2, pi
+
+    (x1, y1), (x2, y2), (x3, y3) = start[:2], mid[:2], end[:2]
+    z = start[2]
+
+    d = 2 * (x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
+    if abs(d) < 1e-12:
+        raise ValueError("Cannot create an arc through collinear points.")
+    cx = (
+        (x1**2 + y1**2) * (y2 - y3)
+        + (x2**2 + y2**2) * (y3 - y1)
+        + (x3**2 + y3**2) * (y1 - y2)
+    ) / d
+    cy = (
+        (x1**2 + y1**2) * (x3 - x2)
+        + (x2**2 + y2**2) * (x1 - x3)
+        + (x3**2 + y3**2) * (x2 - x1)
+    ) / d
+    radius = ((x1 - cx) ** 2 + (y1 - cy) ** 2) ** 0.5
+
+    clockwise = d < 0  # Sign of the (start, mid, end) triangle's orientation
+    y_sign = -1.0 if clockwise else 1.0
+
+    def plane_angle(x, y):
+        return atan2(y_sign * (y - cy), x - cx)
+
+    startAngle = plane_angle(x1, y1)
+    sweep = (plane_angle(x3, y3) - startAngle) % (2 * pi)
+
+    def point(xyz):
+        return {
+            "id": None,
+            "speckle_type": "Objects.Geometry.Point",
+            "totalChildrenCount": 0,
+            "applicationId": None,
+            "units": units,
+            "x": xyz[0],
+            "y": xyz[1],
+            "z": z,
+        }
+
+    def vector(xyz):
+        return {
+            "id": None,
+            "speckle_type": "Objects.Geometry.Vector",
+            "totalChildrenCount": 0,
+            "applicationId": None,
+            "units": units,
+            "x": xyz[0],
+            "y": xyz[1],
+            "z": xyz[2],
+        }
+
+    return {
+        "id": None,
+        "speckle_type": "Objects.Geometry.Arc",
+        "totalChildrenCount": 0,
+        "applicationId": None,
+        "bbox": None,
+        "domain": {
+            "id": None,
+            "speckle_type": "Objects.Primitive.Interval",
+            "totalChildrenCount": 0,
+            "applicationId": None,
+            "end": domain_end,
+            "start": domain_start,
+            "units": units,
+        },
+        "plane": {
+            "id": None,
+            "speckle_type": "Objects.Geometry.Plane",
+            "totalChildrenCount": 0,
+            "applicationId": None,
+            "origin": point([cx, cy]),
+            "normal": vector([0.0, 0.0, y_sign]),
+            "xdir": vector([1.0, 0.0, 0.0]),
+            "ydir": vector([0.0, y_sign, 0.0]),
+            "units": units,
+        },
+        "radius": radius,
+        "startAngle": startAngle,
+        "endAngle": startAngle + sweep,
+        "angleRadians": sweep,
+        "length": radius * sweep,
+        "startPoint": point(start),
+        "midPoint": point(mid),
+        "endPoint": point(end),
+        "units": units,
+    }
+
+
 def speckle_data_package(*walls) -> dict:
     """
     Formats the input data so it can be pushed to Speckle and received as a native Revit wall.
@@ -285,3 +413,26 @@ def remove_duplicates(l: list, tol: float = 1e-6) -> list:
             result.append(item)
 
     return result
+
+
+def remove_duplicate_points(points, tol: float = 1e-6):
+    """
+    NumPy version of remove_duplicates() for an (n, dim) array of points.
+
+    Args:
+        points: Array (or view) of coordinate points.
+        tol: Tolerance for considering points as duplicates
+
+    Returns:
+        Array with duplicates removed, first occurrences kept in their original order
+    """
+    import numpy as np
+
+    points = np.asarray(points, dtype=np.float64)
+    if not len(points):
+        return points
+
+    rounded = np.round(points / tol) if tol else points
+    _, first = np.unique(rounded, axis=0, return_index=True)
+
+    return points[np.sort(first)]
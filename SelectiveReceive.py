@@ -0,0 +1,160 @@
+"""Partial receive of a version, only downloading the geometry of elements that get converted."""
+
+import json
+
+# Object ids per /api/getobjects request, keeps the request bodies reasonably small
+FETCH_BATCH_SIZE = 5000
+
+
+def fetch_objects(transport, ids: list[str]) -> dict[str, str]:
+    """
+    Gets the serialized objects with the given ids, without their children.
+
+    Args:
+        transport: ServerTransport to download from, or any transport implementing get_object().
+        ids (list[str]): Ids of the objects to get.
+
+    Returns:
+        dict[str, str]: Object id -> serialized object.
+    """
+
+    from specklepy.transports.server import ServerTransport
+
+    objects = {}
+    if not isinstance(transport, ServerTransport):
+        for id in ids:
+            objects[id] = transport.get_object(id)
+        return objects
+
+    for batch in range(0, len(ids), FETCH_BATCH_SIZE):
+        response = transport.session.post(
+            f"{transport.url}/api/getobjects/{transport.stream_id}",
+            data={"objects": json.dumps(ids[batch : batch + FETCH_BATCH_SIZE])},
+            stream=True,
+        )
+        response.encoding = "utf-8"
+        for line in response.iter_lines(decode_unicode=True):
+            if line:
+                id, obj = line.split("\t", 1)
+                objects[id] = obj
+
+    return objects
+
+
+def fetch_object(transport, id: str) -> str:
+    """Gets a single serialized object, without its children."""
+
+    from specklepy.logging.exceptions import SpeckleException
+    from specklepy.transports.server import ServerTransport
+
+    if not isinstance(transport, ServerTransport):
+        return transport.get_object(id)
+
+    response = transport.session.get(
+        f"{transport.url}/objects/{transport.stream_id}/{id}/single"
+    )
+    response.encoding = "utf-8"
+    if response.status_code != 200:
+        raise SpeckleException(
+            f"Can't get object {transport.stream_id}/{id}: HTTP error"
+            f" {response.status_code} ({response.text[:1000]})"
+        )
+    return response.text
+
+
+def receive_version_selective(
+    automate_context, categories: set[str], transport=None
+) -> tuple:
+    """
+    Receives the triggering version, skipping the children of elements nobody converts.
+
+    The root object and the element headers (speckle_type, category, name, ...) are always
+    downloaded. The meshes and data chunks below an element are only downloaded when it is
+    a DirectShape whose mapped category is in `categories`; the other elements are left
+    out of the received model. Models whose elements are not detached are received in full.
+
+    Args:
+        automate_context (AutomationContext): Context of the current run.
+        categories (set[str]): Mapped category names to download geometry for.
+        transport: Transport to download from. Defaults to the run's server transport.
+
+    Returns:
+        tuple: (received Base, dict with the number of elements, objects and bytes received).
+    """
+
+    from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+    from specklepy.transports.memory import MemoryTransport
+    from Speckle_SketchUp_mapper import mapping_categories
+
+    run_data = automate_context.automation_run_data
+    version_id = run_data.triggers[0].payload.version_id
+    commit = automate_context.speckle_client.commit.get(run_data.project_id, version_id)
+    if not commit or not commit.referencedObject:
+        raise ValueError(
+            f"Could not receive version {version_id} of project {run_data.project_id}."
+        )
+
+    if transport is None:
+        from specklepy.transports.server import ServerTransport
+
+        transport = ServerTransport(run_data.project_id, automate_context.speckle_client)
+
+    root_serialized = fetch_object(transport, commit.referencedObject)
+    root = json.loads(root_serialized)
+
+    elements_key = "@elements" if "@elements" in root else "elements"
+    element_refs = root.get(elements_key) or []
+    if not all(ref.get("speckle_type") == "reference" for ref in element_refs):
+        # Elements are inlined in the root, nothing to gain from a partial receive
+        base = automate_context.receive_version()
+        return base, {
+            "elements": len(element_refs),
+            "selected_elements": len(element_refs),
+            "objects": None,
+            "bytes": None,
+        }
+
+    memory = MemoryTransport()
+    received_bytes = len(root_serialized.encode("utf-8"))
+
+    # Pass 1: element headers only
+    headers = fetch_objects(transport, [ref["referencedId"] for ref in element_refs])
+    received_bytes += sum(
+        len(header.encode("utf-8")) for header in headers.values()
+    )
+
+    selected = set()
+    children = set()
+    for id, header_serialized in headers.items():
+        header = json.loads(header_serialized)
+        if (
+            header.get("speckle_type") == "Objects.BuiltElements.Revit.DirectShape"
+            and mapping_categories.get(header.get("category")) in categories
+        ):
+            selected.add(id)
+            children.update(header.get("__closure", {}))
+            memory.save_object(id, header_serialized)
+
+    # Pass 2: geometry of the selected elements
+    geometry = fetch_objects(transport, sorted(children - selected))
+    received_bytes += sum(
+        len(obj.encode("utf-8")) for obj in geometry.values()
+    )
+    for id, obj in geometry.items():
+        memory.save_object(id, obj)
+
+    root[elements_key] = [ref for ref in element_refs if ref["referencedId"] in selected]
+    root["__closure"] = {
+        id: depth
+        for id, depth in root.get("__closure", {}).items()
+        if id in memory.objects
+    }
+
+    base = BaseObjectSerializer(read_transport=memory).read_json(json.dumps(root))
+
+    return base, {
+        "elements": len(element_refs),
+        "selected_elements": len(selected),
+        "objects": 1 + len(headers) + len(geometry),
+        "bytes": received_bytes,
+    }
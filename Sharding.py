@@ -0,0 +1,323 @@
+"""Spatial sharding of a model so its elements can be converted by separate processes or runs."""
+
+import json
+from bisect import bisect_right
+from math import ceil
+
+MANIFEST_NAME = "manifest.json"
+
+
+def element_center(element: dict) -> tuple[float, float]:
+    """Center of the XY bounding box of every mesh of an element, see is_convertible()."""
+
+    import numpy as np
+
+    xy = np.concatenate(
+        [
+            np.asarray(mesh.get("vertices") or [], dtype=np.float64).reshape(-1, 3)[:, :2]
+            for mesh in element["baseGeometries"]
+        ]
+    )
+    low, high = xy.min(axis=0), xy.max(axis=0)
+    return float((low[0] + high[0]) / 2), float((low[1] + high[1]) / 2)
+
+
+def quantile_edges(values: list[float], weights: list[int]) -> list[float]:
+    """Inner edges splitting `values` into len(weights) groups sized in proportion to weights."""
+
+    values = sorted(values)
+    if not values:
+        return []
+
+    edges = []
+    total, cumulative = sum(weights), 0
+    for weight in weights[:-1]:
+        cumulative += weight
+        edges.append(values[len(values) * cumulative // total])
+    return edges
+
+
+def build_manifest(
+    elements: list, shard_count: int, version_id: str, inputs: dict
+) -> dict:
+    """
+    Partitions the converted DirectShapes of a model into `shard_count` spatial tiles.
+
+    The tiles form ceil(sqrt(shard_count)) columns, with column edges at quantiles of the
+    element bounding box centers in x and row edges at quantiles in y within each column,
+    so shards get a similar number of elements. An element belongs to the one tile
+    containing its bounding box center; tiles are half-open ([low, high)), so centers on
+    an edge go to the upper tile and every element has exactly one owner. Elements
+    without vertices have nothing to convert and are left out, like furniture.
+
+    Args:
+        elements (list): Serialized elements, in model order.
+        shard_count (int): Number of tiles to create.
+        version_id (str): Id of the source version, checked by later runs.
+        inputs (dict): Function inputs that affect the converted records.
+
+    Returns:
+        dict: The manifest, shards list their element "positions" in `elements` and "ids".
+    """
+
+    from Speckle_SketchUp_mapper import is_convertible
+
+    # The same predicate as the conversion tasks, so every task has one owner
+    candidates = [
+        (position, element)
+        for position, element in enumerate(elements)
+        if is_convertible(element)
+    ]
+    centers = [element_center(element) for _, element in candidates]
+
+    column_count = max(1, ceil(shard_count**0.5))
+    rows_per_column = [
+        shard_count // column_count + (column < shard_count % column_count)
+        for column in range(column_count)
+    ]
+    x_edges = quantile_edges([x for x, _ in centers], rows_per_column)
+
+    column_members = [[] for _ in range(column_count)]
+    for index, (x, _) in enumerate(centers):
+        column_members[bisect_right(x_edges, x)].append(index)
+
+    shards = []
+    for column, members in enumerate(column_members):
+        rows = rows_per_column[column]
+        y_edges = quantile_edges([centers[i][1] for i in members], [1] * rows)
+        row_members = [[] for _ in range(rows)]
+        for i in members:
+            row_members[bisect_right(y_edges, centers[i][1])].append(i)
+
+        for row, tile_members in enumerate(row_members):
+            shards.append(
+                {
+                    "index": len(shards),
+                    "tile": {
+                        "x": [
+                            x_edges[column - 1] if column > 0 else None,
+                            x_edges[column] if column < len(x_edges) else None,
+                        ],
+                        "y": [
+                            y_edges[row - 1] if 0 < row <= len(y_edges) else None,
+                            y_edges[row] if row < len(y_edges) else None,
+                        ],
+                    },
+                    "positions": [candidates[i][0] for i in tile_members],
+                    "ids": [candidates[i][1]["id"] for i in tile_members],
+                }
+            )
+
+    return {
+        "version_id": version_id,
+        "inputs": inputs,
+        "element_count": len(candidates),
+        "shards": shards,
+    }
+
+
+def write_manifest(directory: str, manifest: dict) -> str:
+    from pathlib import Path
+
+    path = Path(directory) / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, default=str)
+    return str(path)
+
+
+def read_manifest(directory: str, elements: list, version_id: str, inputs: dict) -> dict:
+    """
+    Reads the manifest of a sharded run and checks it matches this run.
+
+    Raises:
+        ValueError: If the manifest was built for another version, other inputs, or a
+            different element order.
+    """
+
+    from pathlib import Path
+
+    with open(Path(directory) / MANIFEST_NAME, encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    if manifest["version_id"] != version_id:
+        raise ValueError(
+            f"The shard manifest is for version {manifest['version_id']}, not {version_id}."
+        )
+    if manifest["inputs"] != json.loads(json.dumps(inputs, default=str)):
+        raise ValueError("The shard manifest was built with different function inputs.")
+    for shard in manifest["shards"]:
+        for position, id in zip(shard["positions"], shard["ids"]):
+            if position >= len(elements) or elements[position]["id"] != id:
+                raise ValueError(
+                    f"Element {id} of shard {shard['index']} is not at position {position} of the model."
+                )
+
+    return manifest
+
+
+def shard_output_path(directory: str, index: int) -> str:
+    from pathlib import Path
+
+    return str(Path(directory) / f"shard-{index:04d}.json")
+
+
+def write_shard_output(directory: str, index: int, records: list[dict]) -> str:
+    """Writes the converted records of one shard, see convert_stored_shard()."""
+
+    path = shard_output_path(directory, index)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"index": index, "records": records}, file, default=str)
+    return path
+
+
+def convert_stored_shard(items: list[tuple[int, dict, int]], function_inputs) -> list[dict]:
+    """
+    Worker entry point, converts the (position, element header, store slot) triples of
+    one shard with the VertexStore attached by Converter.init_worker().
+
+    Returns:
+        list[dict]: One Converter.convert_element() result per element, with its
+        "position" and "source_id".
+    """
+
+    from Converter import convert_stored_element
+
+    return [
+        {
+            "position": position,
+            "source_id": element["id"],
+            **convert_stored_element((element, slot, function_inputs)),
+        }
+        for position, element, slot in items
+    ]
+
+
+def check_record(expected: dict[int, str], merged, record: dict) -> None:
+    """Raises ValueError if `record` is not in the manifest or already in `merged`."""
+
+    position = record["position"]
+    if position in merged:
+        raise ValueError(
+            f"Element {record['source_id']} at position {position} was converted by more than one shard."
+        )
+    if expected.get(position) != record["source_id"]:
+        raise ValueError(
+            f"Element {record['source_id']} at position {position} is not in the shard manifest."
+        )
+
+
+def stream_merged(manifest: dict, shard_records, positions: list[int]):
+    """
+    Yields the records of `positions` in order, as soon as the shard holding each arrives.
+
+    Args:
+        manifest (dict): Manifest the shards were converted from.
+        shard_records: Iterable of the records of each shard, in any order.
+        positions (list[int]): Ascending positions to yield, records of other positions
+            in the manifest are ignored (they were restored from a checkpoint).
+
+    Raises:
+        ValueError: If an element was converted twice, or not at all.
+    """
+
+    expected = {
+        position: id
+        for shard in manifest["shards"]
+        for position, id in zip(shard["positions"], shard["ids"])
+    }
+    wanted = set(positions)
+    shard_records = iter(shard_records)
+    pending = {}
+    done = set()
+
+    def receive(records: list[dict]) -> None:
+        for record in records:
+            check_record(expected, pending.keys() | done, record)
+            if record["position"] in wanted:
+                pending[record["position"]] = record
+            else:
+                done.add(record["position"])
+
+    for position in positions:
+        while position not in pending:
+            records = next(shard_records, None)
+            if records is None:
+                raise ValueError(
+                    f"Element {expected.get(position)} at position {position} was not converted by any shard."
+                )
+            receive(records)
+        done.add(position)
+        yield pending.pop(position)
+
+    for records in shard_records:  # Only duplicates can be left
+        receive(records)
+
+
+def merge_shards(
+    manifest: dict, shard_records: list[list[dict]], start: int = 0
+) -> dict[int, dict]:
+    """
+    Combines the records of every shard, checking none is missing or duplicated.
+
+    Args:
+        manifest (dict): Manifest the shards were converted from.
+        shard_records (list[list[dict]]): Records of each shard, see convert_stored_shard().
+        start (int): Position from which elements are expected, earlier ones are ignored
+            (they were restored from a checkpoint).
+
+    Returns:
+        dict[int, dict]: Element position -> record, iterate sorted for model order.
+
+    Raises:
+        ValueError: If an element was converted twice, or not at all.
+    """
+
+    expected = {
+        position: id
+        for shard in manifest["shards"]
+        for position, id in zip(shard["positions"], shard["ids"])
+        if position >= start
+    }
+
+    merged = {}
+    for records in shard_records:
+        for record in records:
+            if record["position"] < start:
+                continue
+            check_record(expected, merged, record)
+            merged[record["position"]] = record
+
+    missing = sorted(set(expected) - set(merged))
+    if missing:
+        raise ValueError(
+            f"{len(missing)} element(s) were not converted by any shard, e.g. {expected[missing[0]]}."
+        )
+
+    return merged
+
+
+def read_shard_outputs(directory: str, manifest: dict) -> list[list[dict]]:
+    """Reads the output of every shard in the manifest."""
+
+    from pathlib import Path
+
+    outputs = []
+    for shard in manifest["shards"]:
+        path = Path(shard_output_path(directory, shard["index"]))
+        if not path.exists():
+            raise ValueError(f"Shard {shard['index']} has not been converted yet ({path}).")
+        with open(path, encoding="utf-8") as file:
+            outputs.append(json.load(file)["records"])
+
+    return outputs
+
+
+def shard_report(manifest: dict) -> str:
+    """Human readable summary of a manifest, for the run status message."""
+
+    sizes = [len(shard["positions"]) for shard in manifest["shards"]]
+    return (
+        f"Sharding: {manifest['element_count']} element(s) in {len(sizes)} spatial tile(s), "
+        f"{min(sizes, default=0)} to {max(sizes, default=0)} per shard."
+    )
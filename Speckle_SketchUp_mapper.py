@@ -112,3 +112,21 @@ mapping_categories = {
     109: "Windows",
     110: "Railings",
 }
+
+# Mapped categories that main.py has a converter for, every other category is skipped
+converted_categories = {"Walls", "Columns", "StructuralColumns"}
+
+
+def is_convertible(element: dict) -> bool:
+    """
+    Whether a serialized element is a DirectShape of a converted category with vertices
+    in its first mesh, the one the conversion reads.
+    """
+
+    meshes = element.get("baseGeometries")
+    return (
+        element["speckle_type"] == "Objects.BuiltElements.Revit.DirectShape"
+        and mapping_categories.get(element.get("category")) in converted_categories
+        and bool(meshes)
+        and len(meshes[0].get("vertices") or []) > 0
+    )
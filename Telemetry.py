@@ -0,0 +1,303 @@
+"""Persisted run telemetry and detection of runtime regressions between runs.
+
+Each run appends one JSON object to a JSONL file (the `Telemetry Path` input). Compare
+the latest runs against the history with:
+
+    python Telemetry.py <telemetry.jsonl> [--last N] [--window 20] [--size-ratio 2]
+"""
+
+import json
+from time import perf_counter
+
+# Bump when the record fields change shape
+TELEMETRY_FORMAT = 1
+
+# Runs up to this factor smaller or larger than a run form its baseline
+SIZE_RATIO = 2.0
+# Number of most recent similar runs in the rolling baseline, and the fewest that count
+BASELINE_WINDOW = 20
+MIN_BASELINE_RUNS = 5
+# Robust z-score (median / MAD) above which a run is slower than its baseline, one-sided
+# p < 0.0013 for normally distributed timings
+Z_THRESHOLD = 3.0
+# Smallest slowdown reported, so tight baselines do not flag noise
+MIN_SLOWDOWN = 0.1
+# Element timings kept per category and run, for Preflight.calibrate_cost_model()
+TIMING_SAMPLE_SIZE = 200
+
+
+def code_version() -> str:
+    """Short hash of the function's Python modules, to tell runs of different code apart."""
+
+    from hashlib import sha256
+    from pathlib import Path
+
+    digest = sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def peak_memory() -> int:
+    """Peak resident memory in bytes of this process or its largest worker process."""
+
+    import resource
+    import sys
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return scale * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+class RunTelemetry:
+    """
+    Collects the metrics of one run: stage timings, element counts per category, vertices
+    processed, peak memory and the size of the output.
+
+    Call lap(stage) at the end of each stage; the time since the previous lap is added to
+    that stage.
+    """
+
+    def __init__(self) -> None:
+        self.start = perf_counter()
+        self._last_lap = self.start
+        self.stages = {}
+        self.metrics = {}
+
+    def lap(self, stage: str) -> None:
+        now = perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last_lap
+        self._last_lap = now
+
+    def update(self, **metrics) -> None:
+        self.metrics.update(metrics)
+
+    def to_record(self, **fields) -> dict:
+        """The run's telemetry record, with `fields` identifying the run."""
+
+        from datetime import datetime, timezone
+
+        return {
+            "format": TELEMETRY_FORMAT,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "code_version": code_version(),
+            **fields,
+            **self.metrics,
+            "duration": perf_counter() - self.start,
+            "stages": dict(self.stages),
+            "peak_memory_bytes": peak_memory(),
+        }
+
+
+def append_record(path: str, record: dict) -> None:
+    """Appends one run record to the JSONL telemetry store."""
+
+    from pathlib import Path
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+    # One write of one line in append mode, so concurrent runs do not interleave
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(line)
+
+
+def read_records(path: str) -> list[dict]:
+    """Reads the run records of a telemetry store, oldest first, skipping torn lines."""
+
+    records = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A run killed mid-write
+            if record.get("format") == TELEMETRY_FORMAT:
+                records.append(record)
+    return records
+
+
+def timing_sample(records: list[dict], size: int = TIMING_SAMPLE_SIZE) -> list[list]:
+    """
+    [category, vertex count, seconds] of up to `size` elements per category, spread evenly
+    over the range of vertex counts. Degraded elements did not run the full conversion
+    and are left out.
+
+    Args:
+        records (list[dict]): ElementTimings.records of the run.
+    """
+
+    by_category = {}
+    for record in records:
+        if not record["degraded"]:
+            by_category.setdefault(record["category"], []).append(record)
+
+    sample = []
+    for category, category_records in sorted(by_category.items()):
+        category_records.sort(key=lambda record: record["vertex_count"])
+        step = max(len(category_records) / size, 1)
+        for i in range(min(size, len(category_records))):
+            record = category_records[int(i * step)]
+            sample.append([category, record["vertex_count"], round(record["duration"], 6)])
+    return sample
+
+
+def read_element_timings(path: str, last: int = BASELINE_WINDOW) -> list[dict]:
+    """Sampled element timings of the `last` successful runs, see timing_sample()."""
+
+    from pathlib import Path
+
+    if not Path(path).exists():
+        return []
+
+    runs = [
+        record
+        for record in read_records(path)
+        if record["status"] == "succeeded" and record.get("element_timings")
+    ][-last:]
+    return [
+        {"category": category, "vertex_count": vertex_count, "duration": duration}
+        for run in runs
+        for category, vertex_count, duration in run["element_timings"]
+    ]
+
+
+def run_metrics(record: dict) -> dict[str, float]:
+    """Seconds per 1000 elements, in total and per stage, of one run record."""
+
+    size = max(record["elements"], 1) / 1000
+    metrics = {"duration": record["duration"] / size}
+    for stage, seconds in record["stages"].items():
+        metrics[stage] = seconds / size
+    return metrics
+
+
+def detect_regressions(
+    history: list[dict],
+    record: dict,
+    window: int = BASELINE_WINDOW,
+    size_ratio: float = SIZE_RATIO,
+    threshold: float = Z_THRESHOLD,
+) -> list[dict]:
+    """
+    Compares one run against the rolling baseline of earlier, similar-sized runs.
+
+    The baseline holds the last `window` successful runs of the same kind before `record`
+    whose element count is within `size_ratio` of its own. Each timing is normalized per
+    1000 elements and flagged when its robust z-score, (value - median) / (1.4826 * MAD),
+    exceeds `threshold` and it is at least MIN_SLOWDOWN slower than the median.
+
+    Args:
+        history (list[dict]): Earlier run records, oldest first.
+        record (dict): The run to check.
+
+    Returns:
+        list[dict]: One {"metric", "value", "median", "slowdown", "z", "baseline_runs"}
+        per regressed timing, empty if the baseline is too small.
+    """
+
+    import numpy as np
+
+    elements = max(record["elements"], 1)
+    baseline = [
+        run
+        for run in history
+        if run["status"] == "succeeded"
+        and run.get("kind") == record.get("kind")
+        and 1 / size_ratio <= max(run["elements"], 1) / elements <= size_ratio
+    ][-window:]
+    if len(baseline) < MIN_BASELINE_RUNS:
+        return []
+
+    baseline_metrics = [run_metrics(run) for run in baseline]
+    regressions = []
+    for metric, value in run_metrics(record).items():
+        values = np.array([m[metric] for m in baseline_metrics if metric in m])
+        if len(values) < MIN_BASELINE_RUNS:
+            continue
+
+        median = float(np.median(values))
+        # A baseline of identical timings has no spread, assume at least 1% of the median
+        scale = max(1.4826 * float(np.median(np.abs(values - median))), 0.01 * median)
+        if scale <= 0:
+            continue
+
+        z = (value - median) / scale
+        if z > threshold and value > median * (1 + MIN_SLOWDOWN):
+            regressions.append(
+                {
+                    "metric": metric,
+                    "value": value,
+                    "median": median,
+                    "slowdown": value / median - 1,
+                    "z": z,
+                    "baseline_runs": len(values),
+                }
+            )
+
+    return regressions
+
+
+def regression_report(record: dict, regressions: list[dict]) -> str:
+    """Human readable list of regressions, for the run status message or the console."""
+
+    if not regressions:
+        return ""
+
+    lines = [
+        f"Slower than similar-sized runs ({record['elements']} elements, "
+        f"code {record['code_version']}):"
+    ]
+    for regression in regressions:
+        lines.append(
+            f"  {regression['metric']}: {regression['value']:.3f} s per 1000 elements, "
+            f"{regression['slowdown']:+.0%} against the median of {regression['baseline_runs']} "
+            f"run(s) (z = {regression['z']:.1f})"
+        )
+    return "\n".join(lines)
+
+
+def compare(path: str, last: int = 1, **options) -> list[tuple[dict, list[dict]]]:
+    """Checks each of the `last` runs of a telemetry store against the runs before it."""
+
+    records = read_records(path)
+    return [
+        (records[i], detect_regressions(records[:i], records[i], **options))
+        for i in range(max(len(records) - last, 0), len(records))
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Flag runs that are significantly slower than similar-sized runs before them."
+    )
+    parser.add_argument("path", help="JSONL telemetry store")
+    parser.add_argument("--last", type=int, default=1, help="number of latest runs to check")
+    parser.add_argument("--window", type=int, default=BASELINE_WINDOW)
+    parser.add_argument("--size-ratio", type=float, default=SIZE_RATIO)
+    parser.add_argument("--threshold", type=float, default=Z_THRESHOLD)
+    args = parser.parse_args()
+
+    regressed = False
+    for record, regressions in compare(
+        args.path,
+        last=args.last,
+        window=args.window,
+        size_ratio=args.size_ratio,
+        threshold=args.threshold,
+    ):
+        print(
+            f"{record['timestamp']} {record.get('version_id')}: {record['elements']} elements, "
+            f"{record['duration']:.2f} s, {record['peak_memory_bytes'] / 1e6:.0f} MB peak"
+        )
+        if regressions:
+            regressed = True
+            print(regression_report(record, regressions))
+
+    sys.exit(1 if regressed else 0)
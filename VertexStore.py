@@ -0,0 +1,92 @@
+"""Ragged vertex and face buffers of a whole model in one memory-mapped float64 file."""
+
+import numpy as np
+
+
+class VertexStore:
+    """
+    Every element's mesh vertices and faces, copied once into a single memory-mapped file.
+
+    Slot i of the store holds the buffers of the i-th mesh passed to build(), located by
+    the (vertex offset, vertex length, face offset, face length) row i of `index`. Faces
+    are stored as float64 too, which is exact for indices below 2**53.
+
+    Pickling a store only sends the file path and the index, so worker processes attach
+    to the same file and read the geometry through zero-copy views of the shared pages.
+
+    Args:
+        path (str): Path of the memory-mapped file.
+        index (np.ndarray): (n, 4) int64 array of offsets and lengths per slot.
+    """
+
+    def __init__(self, path: str, index: np.ndarray) -> None:
+        self.path = str(path)
+        self.index = index
+        self.buffer = np.memmap(self.path, dtype=np.float64, mode="r")
+
+    @classmethod
+    def build(
+        cls, meshes: list[dict], path: str, release: bool = False
+    ) -> "VertexStore":
+        """
+        Copies the "vertices" and "faces" lists of `meshes` into a new store at `path`.
+
+        Args:
+            meshes (list[dict]): Serialized meshes, one per slot.
+            path (str): Path of the memory-mapped file to create.
+            release (bool): Remove the lists from each mesh once copied, so the geometry
+                is never held twice.
+
+        Returns:
+            VertexStore: Read-only store attached to the new file.
+        """
+
+        index = np.zeros((len(meshes), 4), dtype=np.int64)
+        offset = 0
+        for slot, mesh in enumerate(meshes):
+            vertex_count = len(mesh["vertices"])
+            face_count = len(mesh.get("faces") or [])
+            index[slot] = (offset, vertex_count, offset + vertex_count, face_count)
+            offset += vertex_count + face_count
+
+        # An empty memmap cannot be created, keep at least one value
+        buffer = np.memmap(path, dtype=np.float64, mode="w+", shape=(max(offset, 1),))
+        for slot, mesh in enumerate(meshes):
+            vertex_offset, vertex_count, face_offset, face_count = index[slot]
+            buffer[vertex_offset : vertex_offset + vertex_count] = mesh["vertices"]
+            if face_count:
+                buffer[face_offset : face_offset + face_count] = mesh["faces"]
+            if release:
+                mesh.pop("vertices", None)
+                mesh.pop("faces", None)
+        buffer.flush()
+        del buffer
+
+        return cls(path, index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __reduce__(self):
+        return (VertexStore, (self.path, self.index))
+
+    def vertices(self, slot: int) -> np.ndarray:
+        """(n, 3) read-only view of the vertices in `slot`."""
+
+        offset, count = self.index[slot, 0], self.index[slot, 1]
+        return self.buffer[offset : offset + count].reshape(-1, 3)
+
+    def faces(self, slot: int) -> np.ndarray:
+        """Read-only view of the Speckle encoded faces in `slot`."""
+
+        offset, count = self.index[slot, 2], self.index[slot, 3]
+        return self.buffer[offset : offset + count]
+
+    def close(self, delete: bool = False) -> None:
+        """Releases the mapping, and removes the file if `delete` is set."""
+
+        import os
+
+        self.buffer = None  # The mapping closes once the last view is released
+        if delete and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,129 @@
+"""Per-element time budgets, cheap geometry fallbacks and slow-element reporting."""
+
+import signal
+import threading
+from contextlib import contextmanager
+from heapq import nlargest
+
+
+class ElementTimeoutError(Exception):
+    """Raised inside a time_budget() block once its budget has been used up."""
+
+
+@contextmanager
+def time_budget(seconds: float):
+    """
+    Raises ElementTimeoutError inside the block once `seconds` have elapsed.
+
+    The watchdog is a SIGALRM interval timer, so it is only armed on the main thread of a
+    Unix process; anywhere else (or with seconds <= 0) the block runs without a limit.
+    The alarm is delivered between Python bytecodes, so a single long GEOS call finishes
+    before the error is raised.
+
+    Args:
+        seconds (float): Wall clock budget for the block. 0 disables the watchdog.
+    """
+
+    if (
+        seconds <= 0
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise ElementTimeoutError(f"Element exceeded its time budget of {seconds} s.")
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def long_axis_baseline(points: list):
+    """
+    Cheap stand-in for centerline(): the long axis of the minimum rotated rectangle.
+
+    Args:
+        points (list): [x, y] coordinates of the wall footprint, in any order.
+
+    Returns:
+        LineString: Line through the midpoints of the two short sides of the rectangle.
+    """
+
+    from shapely import LineString, MultiPoint
+
+    rectangle = MultiPoint(points).minimum_rotated_rectangle
+    if rectangle.geom_type == "LineString":  # Collinear footprint
+        return rectangle
+    if rectangle.geom_type != "Polygon":  # Single point, no usable axis
+        raise ValueError("Cannot derive a baseline from a degenerate footprint.")
+
+    c0, c1, c2, c3 = list(rectangle.exterior.coords)[:4]
+
+    def midpoint(a, b):
+        return ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+
+    def length(a, b):
+        return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+    if length(c0, c1) >= length(c1, c2):
+        return LineString([midpoint(c3, c0), midpoint(c1, c2)])
+    return LineString([midpoint(c0, c1), midpoint(c2, c3)])
+
+
+class ElementTimings:
+    """Collects how long each element took to convert and which ones were degraded."""
+
+    def __init__(self) -> None:
+        self.records = []
+
+    def record(
+        self,
+        element_id: str,
+        category: str,
+        vertex_count: int,
+        duration: float,
+        degraded: bool = False,
+    ) -> None:
+        self.records.append(
+            {
+                "id": element_id,
+                "category": category,
+                "vertex_count": vertex_count,
+                "duration": duration,
+                "degraded": degraded,
+            }
+        )
+
+    def slowest(self, n: int) -> list[dict]:
+        return nlargest(n, self.records, key=lambda record: record["duration"])
+
+    def degraded(self) -> list[dict]:
+        return [record for record in self.records if record["degraded"]]
+
+    def report(self, n: int) -> str:
+        """Human readable summary of the n slowest elements, for the run status message."""
+
+        if n <= 0 or not self.records:
+            return ""
+
+        lines = [f"Slowest {min(n, len(self.records))} element(s):"]
+        for rank, record in enumerate(self.slowest(n), start=1):
+            lines.append(
+                f"  {rank}. {record['id']} ({record['category']}, "
+                f"{record['vertex_count']} vertices): {record['duration']:.3f} s"
+                + (" [degraded]" if record["degraded"] else "")
+            )
+
+        degraded = self.degraded()
+        if degraded:
+            lines.append(
+                f"{len(degraded)} element(s) exceeded the time budget and were approximated."
+            )
+
+        return "\n".join(lines)
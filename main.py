@@ -1,5 +1,7 @@
 """This module contains the function's main logic."""
 
+from enum import Enum
+
 from pydantic import Field
 from speckle_automate import (
     AutomateBase,
@@ -10,6 +12,25 @@ from speckle_automate import (
 from RevitWall import *
 
 
+class PreflightMode(str, Enum):
+    """What to do with the preflight cost estimate."""
+
+    OFF = "Off"  # No preflight
+    REPORT = "Report"  # Report the plan, run with the configured inputs
+    AUTO = "Auto"  # Report the plan and run with its strategy
+    PLAN_ONLY = "Plan only"  # Report the plan without converting anything
+
+
+class ShardMode(str, Enum):
+    """How the elements of the model are split into spatial shards."""
+
+    OFF = "Off"  # Convert the whole model in this run
+    LOCAL = "Local processes"  # Convert every shard as one task of the worker processes
+    PLAN = "Write manifest"  # Write the shard manifest for separate runs and stop
+    CONVERT = "Convert shard"  # Convert one shard of the manifest and store its output
+    MERGE = "Merge shards"  # Combine the stored shard outputs into one version
+
+
 class FunctionInputs(AutomateBase):
     """These are function author-defined values.
 
@@ -41,26 +62,337 @@ class FunctionInputs(AutomateBase):
         max_length=200,  # Arbitrary upper limit for level name length
     )
 
+    element_time_budget: float = Field(
+        default=30.0,
+        title="Element Time Budget ⏱️",
+        description=(
+            "The maximum time in seconds spent finding the baseline of a single element. Elements that exceed it fall back to "
+            "the long axis of their minimum rotated rectangle and are marked as degraded; walls predicted to exceed it skip the "
+            "expensive geometry entirely. Set to 0 to disable the watchdog."
+        ),
+        ge=0.0,  # Ensure the budget is non-negative
+        le=3600.0,  # Arbitrary upper limit for the budget
+    )
+
+    slow_element_report_count: int = Field(
+        default=10,
+        title="Slow Element Report Count 🐢",
+        description=(
+            "The number of slowest elements (with their ids, vertex counts and durations) listed in the run report."
+        ),
+        ge=0,  # Ensure the count is non-negative
+        le=1000,  # Arbitrary upper limit for the report length
+    )
+
+    fit_arcs: bool = Field(
+        default=True,
+        title="Fit Curved Walls 🌀",
+        description=(
+            "Whether to replace runs of wall centerline points that lie on a circle with a single curved Revit wall, "
+            "instead of one short straight wall per faceted segment."
+        ),
+    )
+
+    arc_tolerance: float = Field(
+        default=0.01,
+        title="Arc Tolerance ⭕",
+        description=(
+            "How far centerline points may deviate from the fitted circle to still count as an arc, as a fraction of "
+            "the arc radius."
+        ),
+        gt=0.0,  # Ensure the tolerance is positive
+        le=0.5,  # Arbitrary upper limit, anything looser is not an arc
+    )
+
+    deduplicate_elements: bool = Field(
+        default=True,
+        title="Remove Duplicate Elements 👯",
+        description=(
+            "Whether to skip elements that duplicate or almost completely overlap another element of the same category. "
+            "One representative is kept and the dropped elements are listed in the run report."
+        ),
+    )
+
+    overlap_threshold: float = Field(
+        default=0.95,
+        title="Overlap Threshold 🧱",
+        description=(
+            "The fraction of footprint area and height two elements must share to be considered overlapping copies. "
+            "1.0 only removes exact duplicates."
+        ),
+        gt=0.0,  # Ensure the threshold is positive
+        le=1.0,  # Elements cannot share more than all of their footprint
+    )
+
+    selective_receive: bool = Field(
+        default=True,
+        title="Selective Receive 📥",
+        description=(
+            "Whether to only download the geometry of elements in a category that gets converted (walls and columns). "
+            "Element headers are always read, but meshes of furniture, planting, etc. are skipped."
+        ),
+    )
+
+    export_directory: str = Field(
+        default="",
+        title="Export Directory 📤",
+        description=(
+            "Directory to write the converted elements to, as NDJSON (one element per line) and as a columnar NumPy .npz "
+            "table. Both files are also attached to the run results. Leave empty to disable the export."
+        ),
+        max_length=1000,  # Arbitrary upper limit for path length
+    )
+
+    checkpoint_directory: str = Field(
+        default="",
+        title="Checkpoint Directory 💾",
+        description=(
+            "Directory to periodically save the converted elements to. If a run is interrupted, the next run on the same "
+            "version with the same inputs resumes from the last checkpoint. Leave empty to disable checkpointing."
+        ),
+        max_length=1000,  # Arbitrary upper limit for path length
+    )
+
+    checkpoint_interval: float = Field(
+        default=30.0,
+        title="Checkpoint Interval ⏲️",
+        description=("The minimum time in seconds between two checkpoints."),
+        gt=0.0,  # Ensure the interval is positive
+        le=3600.0,  # Arbitrary upper limit for the interval
+    )
+
+    parallel_workers: int = Field(
+        default=1,
+        title="Parallel Workers 🧵",
+        description=(
+            "The number of worker processes converting elements. With more than one worker, the vertices of every element "
+            "are copied once into a shared memory-mapped file that the workers read without copying."
+        ),
+        ge=1,  # Ensure at least one worker
+        le=64,  # Arbitrary upper limit for the worker count
+    )
+
+    preflight_mode: PreflightMode = Field(
+        default=PreflightMode.OFF,
+        title="Preflight Mode 🧮",
+        description=(
+            "Scan the element headers and vertex counts before converting, predict the runtime and memory of the run and "
+            "pick the execution strategy (workers, streaming through the vertex store, chunk size). 'Report' only reports "
+            "the plan, 'Auto' also runs with it and 'Plan only' stops after reporting it. 'Auto' uses at most the CPUs "
+            "available to the container, and at most 'Parallel Workers' when that is above 1."
+        ),
+    )
+
+    runtime_budget: float = Field(
+        default=0.0,
+        title="Runtime Budget ⌛",
+        description=(
+            "With preflight on, abort the run before converting if the predicted conversion time in seconds exceeds this. "
+            "0 means no budget."
+        ),
+        ge=0.0,  # Ensure the budget is non-negative
+    )
+
+    memory_budget: float = Field(
+        default=0.0,
+        title="Memory Budget 🧠",
+        description=(
+            "With preflight on, abort the run before converting if the predicted peak memory in MB exceeds this. "
+            "0 means no budget."
+        ),
+        ge=0.0,  # Ensure the budget is non-negative
+    )
+
+    vertex_store_directory: str = Field(
+        default="",
+        title="Vertex Store Directory 🗄️",
+        description=(
+            "Directory for the shared memory-mapped vertex file used by parallel workers. Leave empty to use the system "
+            "temporary directory."
+        ),
+        max_length=1000,  # Arbitrary upper limit for path length
+    )
+
+    shard_mode: ShardMode = Field(
+        default=ShardMode.OFF,
+        title="Shard Mode 🧩",
+        description=(
+            "Split the model into spatial tiles that are converted independently. 'Local processes' converts each tile as "
+            "one task of the 'Parallel Workers' processes. For separate runs or machines, run 'Write manifest' once, then 'Convert shard' for every "
+            "shard index, then 'Merge shards' to create the version. All runs must share the shard directory."
+        ),
+    )
+
+    shard_count: int = Field(
+        default=4,
+        title="Shard Count 🗺️",
+        description=("The number of spatial tiles the model is split into."),
+        ge=1,  # Ensure at least one shard
+        le=1024,  # Arbitrary upper limit for the shard count
+    )
+
+    shard_index: int = Field(
+        default=0,
+        title="Shard Index #️⃣",
+        description=("The shard converted by a 'Convert shard' run, from 0 to the shard count - 1."),
+        ge=0,  # Ensure the index is non-negative
+    )
+
+    shard_directory: str = Field(
+        default="",
+        title="Shard Directory 🗂️",
+        description=(
+            "Directory holding the shard manifest and the output of every converted shard. Required by the 'Write "
+            "manifest', 'Convert shard' and 'Merge shards' modes."
+        ),
+        max_length=1000,  # Arbitrary upper limit for path length
+    )
+
+    telemetry_path: str = Field(
+        default="",
+        title="Telemetry Path 📈",
+        description=(
+            "JSONL file to append the metrics of every run to: element and vertex counts per category, stage timings, "
+            "peak memory and output size. Compare runs with `python Telemetry.py <path>`. Leave empty to disable."
+        ),
+        max_length=1000,  # Arbitrary upper limit for path length
+    )
+
 
 def SketchUp_to_Revit(
     automate_context: AutomationContext, function_inputs: FunctionInputs
 ) -> None:
     """Main function to run the automation."""
 
+    from Telemetry import RunTelemetry
+
+    telemetry = RunTelemetry()
+    telemetry.update(kind="conversion", elements=0)
+    failed = False
+    errors = []
+    exporter = None
     try:
         import json
+        import os
         from specklepy.serialization.base_object_serializer import (
             BaseObjectSerializer,
             Base,
         )
-        from Speckle_SketchUp_mapper import mapping_categories
+        from Speckle_SketchUp_mapper import (
+            converted_categories,
+            is_convertible,
+            mapping_categories,
+        )
+        from Telemetry import timing_sample
+        from Watchdog import ElementTimings
+
+        timings = ElementTimings()
+        dropped = []
+        resume_position = 0
+        preflight_report = ""
+        manifest = None
 
-        raw_speckle_data = automate_context.receive_version()
+        receive_stats = None
+        if function_inputs.selective_receive:
+            from SelectiveReceive import receive_version_selective
+
+            raw_speckle_data, receive_stats = receive_version_selective(
+                automate_context, converted_categories
+            )
+        else:
+            raw_speckle_data = automate_context.receive_version()
+        telemetry.lap("receive")
+
+        # Scan the received objects before parsing them, the parse is the memory peak of the run
+        is_sketchup_model = getattr(raw_speckle_data, "name", None) == "Sketchup Model"
+        workers = function_inputs.parallel_workers
+        use_vertex_store = workers > 1
+        chunk_size = None
+        if is_sketchup_model and (
+            function_inputs.preflight_mode != PreflightMode.OFF
+            or function_inputs.telemetry_path
+        ):
+            from Preflight import COST_MODEL, calibrate_cost_model, scan_elements
+
+            cost_model = COST_MODEL
+            if function_inputs.telemetry_path:
+                from Telemetry import read_element_timings
+
+                cost_model = calibrate_cost_model(
+                    read_element_timings(function_inputs.telemetry_path)
+                )
+
+            received_elements = getattr(raw_speckle_data, "elements", None) or []
+            scan = scan_elements(received_elements, cost_model)
+            telemetry.update(
+                # The whole model, selective receive leaves unconverted elements out
+                elements=(
+                    receive_stats["elements"] if receive_stats else len(received_elements)
+                ),
+                received_elements=len(received_elements),
+                categories={
+                    category: {"elements": entry["elements"], "vertices": entry["vertices"]}
+                    for category, entry in scan.items()
+                },
+            )
+
+        if is_sketchup_model and function_inputs.preflight_mode != PreflightMode.OFF:
+            from Preflight import plan_report, plan_run
+
+            # Above the default of 1, Parallel Workers caps the workers Auto may pick
+            plan = plan_run(
+                scan,
+                max_workers=(
+                    function_inputs.parallel_workers
+                    if function_inputs.parallel_workers > 1
+                    else None
+                ),
+            )
+            preflight_report = plan_report(scan, plan)
+
+            over_budget = []
+            if function_inputs.runtime_budget and (
+                plan["seconds"] > function_inputs.runtime_budget
+            ):
+                over_budget.append(
+                    f"predicted runtime {plan['seconds']:.1f} s exceeds the budget of {function_inputs.runtime_budget:g} s"
+                )
+            if function_inputs.memory_budget and (
+                plan["memory_bytes"] / 1e6 > function_inputs.memory_budget
+            ):
+                over_budget.append(
+                    f"predicted memory {plan['memory_bytes'] / 1e6:.0f} MB exceeds the budget of {function_inputs.memory_budget:g} MB"
+                )
+            if over_budget:
+                automate_context.mark_run_failed(
+                    "Preflight aborted the run: "
+                    + " and ".join(over_budget)
+                    + ". Split the model or raise the budget.\n\n"
+                    + preflight_report
+                )
+                return
+
+            if function_inputs.preflight_mode == PreflightMode.PLAN_ONLY:
+                telemetry.update(kind="preflight")
+                automate_context.mark_run_success(
+                    "Preflight only, nothing was converted.\n\n" + preflight_report
+                )
+                return
+
+            if function_inputs.preflight_mode == PreflightMode.AUTO:
+                workers = plan["workers"]
+                use_vertex_store = plan["vertex_store"]
+                chunk_size = plan["chunk_size"]
+        telemetry.lap("preflight")
+        telemetry.update(workers=workers, vertex_store=use_vertex_store)
 
         speckle_data = json.loads(
             BaseObjectSerializer().write_json(raw_speckle_data)[1]
         )
-        failed = False
+        # The parsed dicts hold every vertex from here on, do not keep a second copy
+        source_object_id = raw_speckle_data.id
+        del raw_speckle_data
+        telemetry.lap("parse")
 
         # Create the Revit friendly data to push to Speckle
         if "name" in speckle_data and speckle_data["name"] == "Sketchup Model":
@@ -69,255 +401,387 @@ def SketchUp_to_Revit(
             walls = []
             tol = function_inputs.tolerance
 
-            for element in speckle_data["elements"]:
-                if element["speckle_type"] == "Objects.BuiltElements.Revit.DirectShape":
-
-                    match mapping_categories[
-                        element["category"]
-                    ]:  # switch for different types of elements
-
-                        case "Walls":
-
-                            from shapely.geometry.polygon import Polygon
-                            from pygeoops import centerline
-
-                            errors = []
+            elements = speckle_data["elements"]
+
+            if function_inputs.deduplicate_elements:
+                from Deduplicate import drop_duplicate_elements
+
+                elements, dropped = drop_duplicate_elements(
+                    elements, tol, function_inputs.overlap_threshold
+                )
+            telemetry.lap("deduplicate")
+
+            version_id = automate_context.automation_run_data.triggers[
+                0
+            ].payload.version_id
+            conversion_inputs = function_inputs.model_dump(
+                exclude={  # Inputs that do not change the converted elements
+                    "slow_element_report_count",
+                    "export_directory",
+                    "checkpoint_directory",
+                    "checkpoint_interval",
+                    "parallel_workers",
+                    "vertex_store_directory",
+                    "preflight_mode",
+                    "runtime_budget",
+                    "memory_budget",
+                    "shard_mode",
+                    "shard_count",
+                    "shard_index",
+                    "shard_directory",
+                    "telemetry_path",
+                }
+            )
 
-                            vertices = remove_duplicates(
-                                list(
-                                    get_coordinates_from_list(
-                                        element["baseGeometries"][0]["vertices"]
-                                    )
-                                ),
-                                tol,
+            shard_mode = function_inputs.shard_mode
+            shard_positions = None
+            shard_records = []
+            if shard_mode != ShardMode.OFF:
+                telemetry.update(kind=f"{shard_mode.value} conversion")
+                from Sharding import (
+                    build_manifest,
+                    read_manifest,
+                    shard_report,
+                    write_manifest,
+                )
+
+                if shard_mode != ShardMode.LOCAL and not function_inputs.shard_directory:
+                    raise ValueError(
+                        f"The '{shard_mode.value}' shard mode needs a shard directory."
+                    )
+
+                if shard_mode in (ShardMode.LOCAL, ShardMode.PLAN):
+                    manifest = build_manifest(
+                        elements,
+                        function_inputs.shard_count,
+                        version_id,
+                        conversion_inputs,
+                    )
+                else:
+                    manifest = read_manifest(
+                        function_inputs.shard_directory,
+                        elements,
+                        version_id,
+                        conversion_inputs,
+                    )
+
+                if shard_mode == ShardMode.PLAN:
+                    telemetry.update(kind="shard manifest")
+                    automate_context.store_file_result(
+                        write_manifest(function_inputs.shard_directory, manifest)
+                    )
+                    automate_context.mark_run_success(
+                        "Wrote the shard manifest, nothing was converted. Run 'Convert shard' for shard index 0 to "
+                        f"{len(manifest['shards']) - 1}, then 'Merge shards'.\n\n"
+                        + shard_report(manifest)
+                    )
+                    return
+
+                if shard_mode == ShardMode.CONVERT:
+                    if function_inputs.shard_index >= len(manifest["shards"]):
+                        raise ValueError(
+                            f"Shard index {function_inputs.shard_index} is out of range, the manifest has "
+                            f"{len(manifest['shards'])} shard(s)."
+                        )
+                    shard_positions = set(
+                        manifest["shards"][function_inputs.shard_index]["positions"]
+                    )
+                telemetry.lap("shard")
+
+            if function_inputs.export_directory:
+                from pathlib import Path
+                from Export import ElementExporter
+
+                exporter = ElementExporter(
+                    Path(function_inputs.export_directory)
+                    / (
+                        f"{version_id}-shard-{function_inputs.shard_index:04d}"
+                        if shard_mode == ShardMode.CONVERT
+                        else version_id
+                    )
+                )
+
+            checkpoint = None
+            if function_inputs.checkpoint_directory:
+                from Checkpoint import ConversionCheckpoint
+
+                checkpoint = ConversionCheckpoint(
+                    function_inputs.checkpoint_directory,
+                    version_id=version_id,
+                    inputs=(
+                        # Every shard of a manifest resumes on its own
+                        {**conversion_inputs, "shard_index": function_inputs.shard_index}
+                        if shard_mode == ShardMode.CONVERT
+                        else conversion_inputs
+                    ),
+                    interval=function_inputs.checkpoint_interval,
+                )
+                resume_position, restored = checkpoint.load(elements)
+
+                for entry in restored:
+                    walls.extend(entry["walls"])
+                    columns.extend(entry["columns"])
+                    errors.extend(entry["errors"])
+                    timings.record(
+                        element_id=entry["source_id"],
+                        category=mapping_categories[
+                            elements[entry["position"]]["category"]
+                        ],
+                        vertex_count=entry["vertex_count"],
+                        duration=entry["duration"],
+                        degraded=entry["degraded"],
+                    )
+                    if exporter:
+                        for record in entry["walls"] + entry["columns"]:
+                            exporter.write(record, source_id=entry["source_id"])
+                    if shard_mode == ShardMode.CONVERT:
+                        shard_records.append(entry)
+
+            tasks = [
+                (position, element)
+                for position, element in enumerate(elements)
+                if position >= resume_position  # Skip what the last checkpoint holds
+                and is_convertible(element)
+                and (shard_positions is None or position in shard_positions)
+            ]
+
+            store = None
+            store_path = None
+            executor = None
+            try:
+                if shard_mode == ShardMode.MERGE:
+                    from Sharding import merge_shards, read_shard_outputs
+
+                    merged = merge_shards(
+                        manifest,
+                        read_shard_outputs(function_inputs.shard_directory, manifest),
+                        start=resume_position,
+                    )
+                    results = (merged[position] for position, _ in tasks)
+                elif use_vertex_store or shard_mode == ShardMode.LOCAL:
+                    from concurrent.futures import ProcessPoolExecutor
+                    from tempfile import mkstemp
+                    from Converter import convert_stored_element, init_worker
+                    from VertexStore import VertexStore
+
+                    descriptor, store_path = mkstemp(
+                        suffix=".vertices",
+                        dir=function_inputs.vertex_store_directory or None,
+                    )
+                    os.close(descriptor)
+                    store = VertexStore.build(
+                        [element["baseGeometries"][0] for _, element in tasks],
+                        store_path,
+                        release=True,  # The store holds the geometry from now on
+                    )
+                    for _, element in tasks:
+                        del element["baseGeometries"]
+
+                    executor = ProcessPoolExecutor(
+                        workers,
+                        initializer=init_worker,
+                        initargs=(store,),
+                    )
+                    if shard_mode == ShardMode.LOCAL:
+                        from concurrent.futures import as_completed
+                        from Sharding import convert_stored_shard, stream_merged
+
+                        # Each tile is one task of (position, header, slot), its geometry
+                        # is read from the store in the worker
+                        slots = {
+                            position: slot for slot, (position, _) in enumerate(tasks)
+                        }
+                        futures = [
+                            executor.submit(
+                                convert_stored_shard,
+                                [
+                                    (position, elements[position], slots[position])
+                                    for position in shard["positions"]
+                                    if position in slots
+                                ],
+                                function_inputs,
                             )
+                            for shard in manifest["shards"]
+                        ]
+                        # In model order, so checkpoints keep working
+                        results = stream_merged(
+                            manifest,
+                            (future.result() for future in as_completed(futures)),
+                            list(slots),
+                        )
+                    else:
+                        results = executor.map(
+                            convert_stored_element,
+                            [
+                                (element, slot, function_inputs)
+                                for slot, (_, element) in enumerate(tasks)
+                            ],
+                            chunksize=chunk_size
+                            or max(1, len(tasks) // (workers * 8)),
+                        )
+                else:
+                    import numpy as np
+                    from Converter import convert_element
+
+                    results = (
+                        convert_element(
+                            element,
+                            np.asarray(
+                                element["baseGeometries"][0]["vertices"],
+                                dtype=np.float64,
+                            ).reshape(-1, 3),
+                            function_inputs,
+                        )
+                        for _, element in tasks
+                    )
+
+                for (position, element), result in zip(tasks, results):
+                    walls.extend(result["walls"])
+                    columns.extend(result["columns"])
+                    errors.extend(result["errors"])
+
+                    timings.record(
+                        element_id=element["id"],
+                        category=mapping_categories[element["category"]],
+                        vertex_count=result["vertex_count"],
+                        duration=result["duration"],
+                        degraded=result["degraded"],
+                    )
+
+                    if exporter:
+                        for record in result["walls"] + result["columns"]:
+                            exporter.write(record, source_id=element["id"])
+
+                    if shard_mode == ShardMode.CONVERT:
+                        shard_records.append(
+                            {"position": position, "source_id": element["id"], **result}
+                        )
+
+                    if checkpoint:
+                        checkpoint.add(
+                            position,
+                            source_id=element["id"],
+                            walls=result["walls"],
+                            columns=result["columns"],
+                            degraded=result["degraded"],
+                            errors=result["errors"],
+                            vertex_count=result["vertex_count"],
+                            duration=result["duration"],
+                        )
+                        checkpoint.maybe_save(position + 1)
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+                if store is not None:  # An empty store is falsy
+                    store.close(delete=True)
+                elif store_path is not None and os.path.exists(store_path):
+                    os.remove(store_path)  # The store was never built
+
+            failed = bool(errors)
+            telemetry.lap("convert")
+            telemetry.update(
+                converted_elements=len(timings.records),
+                vertices=sum(record["vertex_count"] for record in timings.records),
+                degraded=len(timings.degraded()),
+                dropped=len(dropped),
+                errors=len(errors),
+                element_timings=timing_sample(timings.records),
+            )
 
-                            # Getting the coordinates of the vertices
-                            vertices.sort(key=lambda x: x[2])
-
-                            base_polygon = []
-                            for (
-                                vertex
-                            ) in vertices:  # Only get the base polygon of the wall
-                                if (
-                                    vertex[2] > vertices[0][2] - tol
-                                    and vertex[2] < vertices[-1][2] + tol
-                                ):
-                                    base_polygon.append(vertex[0:2])
-
-                            # Get the centerline of the polygon to use as the baseLine
-                            try:
-                                from shapely import concave_hull
-
-                                base_polygon = concave_hull(Polygon(base_polygon))
-
-                                baseLine_raw = centerline(base_polygon, extend=True)
-                                baseLine_cooked = list(baseLine_raw.coords)  # type: ignore
-
-                                # Split the baseLine into straight line segments for Revit
-                                baseLines = []
-                                for segment in range(len(baseLine_cooked) - 1):
-                                    baseLines.append(
-                                        [
-                                            baseLine_cooked[segment],
-                                            baseLine_cooked[segment + 1],
-                                        ]
-                                    )
-
-                                for (
-                                    baseLine
-                                ) in baseLines:  # Loop for multiple baseLines
-
-                                    # Add the Revit formatted data to the walls list
-                                    walls.append(
-                                        revit_wall_data(
-                                            units=element["units"],
-                                            baseLine_start=[
-                                                baseLine[0][0],
-                                                baseLine[0][1],
-                                                vertices[0][2],
-                                            ],
-                                            baseLine_end=[
-                                                baseLine[1][0],
-                                                baseLine[1][1],
-                                                vertices[0][2],
-                                            ],
-                                            baseLine_length=baseLine_raw.length,  # type: ignore
-                                            baseOffset=vertices[0][2],
-                                            height=vertices[-1][2] - vertices[0][2],
-                                            type=(  # Use default value if name is not provided
-                                                element["name"]
-                                                if (
-                                                    "name" in element
-                                                    and (
-                                                        element["name"] != "<Mixed>"
-                                                        or not str(
-                                                            element["name"]
-                                                        ).isspace()
-                                                    )
-                                                    and element["name"] != ""
-                                                )
-                                                else "Wall-Int_12P-100Blk-12P"
-                                            ),
-                                            level_name=function_inputs.reference_level,
-                                            comment=(
-                                                "[Speckle Automate]: Type specified."
-                                                if (
-                                                    "name" in element
-                                                    and (
-                                                        element["name"] != "<Mixed>"
-                                                        or not str(
-                                                            element["name"]
-                                                        ).isspace()
-                                                    )
-                                                    and element["name"] != ""
-                                                )
-                                                else "[Speckle Automate]: Type not specified, default used."
-                                            ),
-                                        )
-                                    )
-                            except Exception as e:
-                                from traceback import format_exc
-
-                                errors.append(
-                                    {
-                                        "Error": "There was an error while creating the Revit data.",
-                                        "Element": element,
-                                        "Error Message": f"{e}",
-                                        "Traceback": str(format_exc()),
-                                        "Base Polygon": base_polygon,
-                                    }
-                                )
-                                failed = True
-
-                        case "Columns" | "StructuralColumns":
-
-                            errors = []
-
-                            # Get and sort the vertices by z-coordinate
-                            vertices = remove_duplicates(
-                                list(
-                                    get_coordinates_from_list(
-                                        element["baseGeometries"][0]["vertices"]
-                                    )
-                                ),
-                                tol,
-                            )
-                            vertices.sort(key=lambda x: x[2])
-
-                            try:
-                                from shapely.geometry.polygon import Polygon
-                                from shapely import force_2d
-                                from RevitColumn import revit_column_data
-
-                                # Get center points / baseLine points from top and bottom polygons
-                                bottom_polygon = Polygon(
-                                    [
-                                        vertex
-                                        for vertex in vertices
-                                        if vertex[2] > vertices[0][2] - tol
-                                        and vertex[2] < vertices[0][2] + tol
-                                    ]
-                                ).convex_hull
-                                top_polygon = Polygon(
-                                    [
-                                        vertex
-                                        for vertex in vertices
-                                        if vertex[2] > vertices[-1][2] - tol
-                                        and vertex[2] < vertices[-1][2] + tol
-                                    ]
-                                ).convex_hull
-
-                                if len(bottom_polygon.boundary.coords) > 5:
-                                    is_placeholder = (
-                                        "PLACEHOLDER, this column is not rectangular. "
-                                    )
-                                else:
-                                    is_placeholder = ""
-
-                                baseLine_start = list(bottom_polygon.centroid.coords[0])
-                                baseLine_end = list(top_polygon.centroid.coords[0])
-
-                                columns.append(
-                                    revit_column_data(
-                                        units=element["units"],
-                                        baseLine_start=baseLine_start
-                                        + [vertices[0][2]],
-                                        baseLine_end=baseLine_end + [vertices[-1][2]],
-                                        baseLine_length=vertices[-1][2]
-                                        - vertices[0][2],
-                                        baseOffset=vertices[0][2],
-                                        type=(  # Use default value if name is not provided
-                                            element["name"]
-                                            if (
-                                                "name" in element
-                                                and (
-                                                    element["name"] != "<Mixed>"
-                                                    or not str(
-                                                        element["name"]
-                                                    ).isspace()
-                                                )
-                                                and element["name"] != ""
-                                            )
-                                            else "450x450mm"
-                                        ),
-                                        level_name=function_inputs.reference_level,
-                                        isSlanted=(  # Check if the column is vertically slanted
-                                            not force_2d(bottom_polygon).equals_exact(
-                                                force_2d(top_polygon), tol
-                                            )
-                                        ),
-                                        comment=(
-                                            f"[Speckle Automate]: {is_placeholder}Type specified."
-                                            if (
-                                                "name" in element
-                                                and (
-                                                    element["name"] != "<Mixed>"
-                                                    or not str(
-                                                        element["name"]
-                                                    ).isspace()
-                                                )
-                                                and element["name"] != ""
-                                            )
-                                            else f"[Speckle Automate]: {is_placeholder}Type not specified, default used."
-                                        ),
-                                    )
-                                )
-
-                            except Exception as e:
-                                from traceback import format_exc
-
-                                errors.append(
-                                    {
-                                        "Error": "There was an error while creating the Revit data.",
-                                        "Element": element,
-                                        "Error Message": f"{e}",
-                                        "Traceback": str(format_exc()),
-                                        "Vertices": vertices,
-                                    }
-                                )
-                                failed = True
-
-                        case _:
-                            pass
+            if exporter:
+                exporter.close()
+                automate_context.store_file_result(exporter.ndjson_path)
+                automate_context.store_file_result(exporter.npz_path)
+                telemetry.lap("export")
+
+            if shard_mode == ShardMode.CONVERT:
+                from Sharding import write_shard_output
+
+                automate_context.store_file_result(
+                    write_shard_output(
+                        function_inputs.shard_directory,
+                        function_inputs.shard_index,
+                        shard_records,
+                    )
+                )
+                if checkpoint:
+                    checkpoint.clear()  # The shard output holds every record now
+                automate_context.mark_run_success(
+                    f"Converted shard {function_inputs.shard_index} of {len(manifest['shards'])} "
+                    f"({len(shard_records)} element(s)), run 'Merge shards' once every shard is converted.\n\n"
+                    + timings.report(function_inputs.slow_element_report_count)
+                )
+                return
 
             revit_data = [*(walls if walls else []), *(columns if columns else [])]
             if not revit_data:
                 revit_data = errors
 
             revit_data = speckle_data_package(*revit_data)
+            if function_inputs.telemetry_path:
+                telemetry.update(
+                    output_objects=len(revit_data["data"]),
+                    output_bytes=len(json.dumps(revit_data, default=str)),
+                )
 
             # Push the Revit data to Speckle
             automate_context.create_new_version_in_project(
                 root_object=Base(**revit_data),
                 model_name="Speckle Automate: SketchUp to Revit",
                 version_message="Speckle Automate created version for:"
-                + str(raw_speckle_data.id),
+                + str(source_object_id),
             )
+            telemetry.lap("send")
+
+            if checkpoint:
+                checkpoint.clear()  # The version exists now, nothing left to resume
+
+            if timings.degraded():
+                automate_context.attach_warning_to_objects(
+                    category="Degraded elements",
+                    object_ids=[record["id"] for record in timings.degraded()],
+                    message="Element exceeded the time budget, its baseline was approximated (see the element comment).",
+                )
+
+            if dropped:
+                automate_context.attach_info_to_objects(
+                    category="Duplicate elements",
+                    object_ids=[record["id"] for record in dropped],
+                    message="Element duplicates or overlaps another element and was not converted.",
+                )
 
         automate_context.mark_run_success(
             "Automation completed successfully.\n"
             + str(automate_context.automation_run_data)
+            + (
+                f"\n\nSelective receive: geometry downloaded for {receive_stats['selected_elements']} "
+                f"of {receive_stats['elements']} element(s)"
+                + (
+                    f", {receive_stats['objects']} objects / {receive_stats['bytes'] / 1e6:.2f} MB received."
+                    if receive_stats["bytes"] is not None
+                    else "."
+                )
+                if receive_stats
+                else ""
+            )
+            + (
+                f"\n\nResumed from a checkpoint, skipped the first {resume_position} element(s)."
+                if resume_position
+                else ""
+            )
+            + (f"\n\n{preflight_report}" if preflight_report else "")
+            + (f"\n\n{shard_report(manifest)}" if manifest else "")
+            + "\n\n"
+            + timings.report(function_inputs.slow_element_report_count)
+            + (
+                f"\n\nDropped {len(dropped)} duplicate/overlapping element(s):\n"
+                + "\n".join(
+                    f"  {record['id']} ({record['reason']} of {record['kept_id']}, {record['overlap']:.0%} shared)"
+                    for record in dropped
+                )
+                if dropped
+                else ""
+            )
         )
 
     except Exception as e:
@@ -328,6 +792,31 @@ def SketchUp_to_Revit(
         )
 
     finally:
+        if exporter:
+            exporter.close()  # Keeps the partial export of a failed run, no-op if closed
+
+        # Before marking the exception, which reports to the server and can raise
+        if function_inputs.telemetry_path:
+            from Telemetry import append_record
+
+            run_data = automate_context.automation_run_data
+            try:
+                append_record(
+                    function_inputs.telemetry_path,
+                    telemetry.to_record(
+                        run_id=run_data.function_run_id,
+                        project_id=run_data.project_id,
+                        version_id=run_data.triggers[0].payload.version_id,
+                        status=(
+                            "exception"
+                            if failed
+                            else automate_context.run_status.value.lower()
+                        ),
+                    ),
+                )
+            except OSError:
+                pass  # Telemetry never fails a run
+
         if failed:
             from traceback import format_exc
 
@@ -0,0 +1,330 @@
+"""In-process stand-in for a Speckle server, and an AutomationContext wired to it.
+
+FakeSpeckleServer implements the REST routes the SDK transports use (object download,
+/api/getobjects, /api/diff, object upload and blob upload) on a local HTTP server, with
+a configurable latency per request. It counts the objects and bytes that go each way.
+fake_automation_context() returns a real speckle_automate AutomationContext whose
+ServerTransport points at it, so receive_version(), create_new_version_in_project()
+and the result-marking calls run their actual code paths.
+"""
+
+import gzip
+import json
+import threading
+import time
+from email import message_from_bytes
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+from specklepy.objects import Base
+from specklepy.objects.geometry import Mesh
+from specklepy.objects.other import Collection
+
+
+class DirectShape(
+    Base,
+    speckle_type="Objects.BuiltElements.Revit.DirectShape",
+    detachable={"baseGeometries"},
+):
+    """DirectShape as sent by the SketchUp connector, with detached meshes."""
+
+
+class FakeSpeckleServer:
+    """
+    Object storage of a single project behind a local HTTP server.
+
+    Args:
+        latency (float): Seconds slept before answering each request.
+        storage_dir (str | None): Directory to load objects and versions from when
+            started, and to save them to with save().
+    """
+
+    def __init__(self, latency: float = 0.0, storage_dir: str | None = None) -> None:
+        self.latency = latency
+        self.storage_dir = Path(storage_dir) if storage_dir else None
+        self.objects = {}
+        self.versions = {}
+        self.blobs = {}
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+        if self.storage_dir and (self.storage_dir / "objects.ndjson").exists():
+            with open(self.storage_dir / "objects.ndjson", encoding="utf-8") as file:
+                for line in file:
+                    id, obj = line.rstrip("\n").split("\t", 1)
+                    self.objects[id] = obj
+        if self.storage_dir and (self.storage_dir / "versions.json").exists():
+            with open(self.storage_dir / "versions.json", encoding="utf-8") as file:
+                self.versions = json.load(file)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self) -> "FakeSpeckleServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeSpeckleServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        self.stats = {
+            "requests": 0,
+            "objects_downloaded": 0,
+            "bytes_downloaded": 0,
+            "objects_uploaded": 0,
+            "bytes_uploaded": 0,
+        }
+
+    def save(self) -> None:
+        """
+        Writes every stored object to `<storage_dir>/objects.ndjson` and the versions to
+        `<storage_dir>/versions.json`, so a later server can run them without add_model().
+        """
+
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.storage_dir / "objects.ndjson", "w", encoding="utf-8") as file:
+            for id, obj in self.objects.items():
+                file.write(f"{id}\t{obj}\n")
+        with open(self.storage_dir / "versions.json", "w", encoding="utf-8") as file:
+            json.dump(self.versions, file)
+
+    def add_model(self, root: Base, model_id: str = "sketchup") -> str:
+        """Stores a model without going through HTTP and returns the new version id."""
+
+        from specklepy.api import operations
+        from specklepy.transports.memory import MemoryTransport
+
+        memory = MemoryTransport()
+        root_id = operations.send(root, [memory], use_default_cache=False)
+        self.objects.update(memory.objects)
+        return self.create_version(root_id, model_id)
+
+    def create_version(self, root_id: str, model_id: str, message: str = "") -> str:
+        version_id = uuid4().hex[:10]
+        self.versions[version_id] = {
+            "referencedObject": root_id,
+            "model_id": model_id,
+            "message": message,
+        }
+        return version_id
+
+    def _count(self, direction: str, objects: int, size: int) -> None:
+        with self.lock:
+            self.stats[f"objects_{direction}"] += objects
+            self.stats[f"bytes_{direction}"] += size
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _begin(self) -> list[str]:
+                with server.lock:
+                    server.stats["requests"] += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                return self.path.strip("/").split("/")
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def _reply(self, status: int, body: bytes, content_type="text/plain"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                parts = self._begin()
+                # /objects/<project>/<id>/single
+                if len(parts) == 4 and parts[0] == "objects" and parts[3] == "single":
+                    obj = server.objects.get(parts[2])
+                    if obj is None:
+                        return self._reply(404, b"Object not found")
+                    body = obj.encode("utf-8")
+                    server._count("downloaded", 1, len(body))
+                    return self._reply(200, body)
+                self._reply(404, b"Unknown route")
+
+            def do_POST(self) -> None:
+                parts = self._begin()
+                body = self._body()
+
+                # /api/getobjects/<project>: newline separated "id\tobject"
+                if parts[:2] == ["api", "getobjects"]:
+                    ids = json.loads(parse_qs(body.decode("utf-8"))["objects"][0])
+                    lines = [
+                        f"{id}\t{server.objects[id]}" for id in ids if id in server.objects
+                    ]
+                    payload = "\n".join(lines).encode("utf-8")
+                    server._count("downloaded", len(lines), len(payload))
+                    return self._reply(200, payload)
+
+                # /api/diff/<project>: which objects the server already has
+                if parts[:2] == ["api", "diff"]:
+                    ids = json.loads(parse_qs(body.decode("utf-8"))["objects"][0])
+                    payload = json.dumps({id: id in server.objects for id in ids})
+                    return self._reply(200, payload.encode(), "application/json")
+
+                # /objects/<project>: gzipped JSON array batches as multipart files
+                if parts[0] == "objects" and len(parts) == 2:
+                    message = message_from_bytes(
+                        b"Content-Type: "
+                        + self.headers["Content-Type"].encode()
+                        + b"\r\n\r\n"
+                        + body,
+                        policy=default_policy,
+                    )
+                    for part in message.iter_parts():
+                        batch = gzip.decompress(part.get_payload(decode=True))
+                        objects = json.loads(batch)
+                        for obj in objects:
+                            server.objects[obj["id"]] = json.dumps(obj)
+                        server._count("uploaded", len(objects), len(batch))
+                    return self._reply(201, b"Created")
+
+                # /api/stream/<project>/blob: file results
+                if parts[:2] == ["api", "stream"] and parts[-1] == "blob":
+                    blob_id = uuid4().hex[:10]
+                    server.blobs[blob_id] = body
+                    payload = json.dumps(
+                        {
+                            "uploadResults": [
+                                {"blobId": blob_id, "fileName": blob_id, "uploadStatus": 1}
+                            ]
+                        }
+                    )
+                    return self._reply(201, payload.encode(), "application/json")
+
+                self._reply(404, b"Unknown route")
+
+        return Handler
+
+
+class FakeSpeckleClient:
+    """The parts of SpeckleClient used by AutomationContext, backed by a FakeSpeckleServer."""
+
+    def __init__(self, server: FakeSpeckleServer, token: str) -> None:
+        from specklepy.core.api.credentials import Account
+
+        self.url = server.url
+        self.account = Account(token=token)
+        self.account.serverInfo.url = server.url
+
+        def get_commit(project_id, version_id):
+            version = server.versions.get(version_id)
+            return SimpleNamespace(**version) if version else None
+
+        def create_commit(stream_id, object_id, branch_name, message="", **kwargs):
+            return server.create_version(object_id, branch_name, message)
+
+        self.commit = SimpleNamespace(get=get_commit, create=create_commit)
+        self.branch = SimpleNamespace(
+            get=lambda project_id, name, commits_limit=10: None,
+            create=lambda project_id, name, *args, **kwargs: name,
+        )
+
+
+def fake_automation_context(server: FakeSpeckleServer, version_id: str):
+    """Returns a speckle_automate AutomationContext for `version_id` on the fake server."""
+
+    from speckle_automate import AutomationContext, AutomationRunData
+    from specklepy.transports.server import ServerTransport
+
+    token = "fake-token"
+    run_data = AutomationRunData(
+        project_id="project",
+        speckle_server_url=server.url + "/",
+        automation_id="automation",
+        automation_run_id="run",
+        function_run_id="function-run",
+        triggers=[
+            {
+                "triggerType": "versionCreation",
+                "payload": {
+                    "modelId": server.versions[version_id]["model_id"],
+                    "versionId": version_id,
+                },
+            }
+        ],
+    )
+    client = FakeSpeckleClient(server, token)
+    transport = ServerTransport("project", account=client.account)
+
+    return AutomationContext(run_data, client, transport, token)
+
+
+def generate_model(element_count: int, seed: int = 0) -> Collection:
+    """
+    Generates a SketchUp-like model: 60% walls (straight and L-shaped), 15% columns and
+    25% furniture with heavier meshes, laid out on a grid.
+
+    Args:
+        element_count (int): Number of elements in the model.
+        seed (int): Seed for the random wall lengths and heights.
+    """
+
+    import random
+
+    rng = random.Random(seed)
+
+    def prism(outline, z0, z1):
+        vertices = []
+        for z in (z0, z1):
+            for x, y in outline:
+                vertices += [float(x), float(y), float(z)]
+        n = len(outline)
+        faces = [n, *range(n), n, *range(n, 2 * n)]
+        for i in range(n):  # Sides as quads
+            j = (i + 1) % n
+            faces += [4, i, j, n + j, n + i]
+        return Mesh(vertices=vertices, faces=faces, units="mm")
+
+    elements = []
+    for i in range(element_count):
+        x0, y0 = (i % 100) * 6000.0, (i // 100) * 6000.0
+        height = rng.choice([2700.0, 3000.0, 3600.0])
+        kind = rng.random()
+
+        if kind < 0.6:
+            length = rng.uniform(1500, 5000)
+            if kind < 0.3:  # Straight wall
+                outline = [(0, 0), (length, 0), (length, 200), (0, 200)]
+            else:  # L-shaped wall
+                outline = [(0, 0), (length, 0), (length, 200), (200, 200), (200, length), (0, length)]
+            category, name = 107, rng.choice(["", "Wall-Ext_102Bwk-75Ins-100LBlk-12P"])
+        elif kind < 0.75:
+            outline = [(0, 0), (450, 0), (450, 450), (0, 450)]
+            category, name = 90, ""
+        else:  # Furniture, a 64-sided table that nobody converts
+            from math import cos, pi, sin
+
+            outline = [(400 + 400 * cos(2 * pi * k / 64), 400 + 400 * sin(2 * pi * k / 64)) for k in range(64)]
+            category, name, height = 46, "Table", 750.0
+
+        element = DirectShape(category=category, name=name, units="mm")
+        element.baseGeometries = [
+            prism([(x0 + x, y0 + y) for x, y in outline], 0.0, height)
+        ]
+        elements.append(element)
+
+    return Collection(name="Sketchup Model", collectionType="model", elements=elements)
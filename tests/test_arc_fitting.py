@@ -0,0 +1,37 @@
+"""Unit tests for fitting arcs to wall centerlines."""
+
+from math import cos, pi, sin
+
+from ArcFitting import fit_arcs
+from RevitWall import arc_data
+
+
+def test_faceted_arc_becomes_one_segment():
+    arc = [(1000 * cos(t), 1000 * sin(t)) for t in [i * pi / 24 for i in range(13)]]
+    segments = fit_arcs([(1000, -500)] + arc + [(-500, 1000)])
+
+    assert len(segments) == 3
+    assert len(segments[0]) == 2 and len(segments[2]) == 2
+    start, mid, end = segments[1]
+    assert start == arc[0] and end == arc[-1]
+    assert abs(mid[0] - 1000 * cos(pi / 4)) < 1e-6
+    assert abs(mid[1] - 1000 * sin(pi / 4)) < 1e-6
+
+
+def test_corners_stay_straight():
+    # A closed rectangle's corners lie on a circle, but they are not an arc
+    rectangle = [(0, 0), (10, 0), (10, 5), (0, 5), (0, 0)]
+    assert fit_arcs(rectangle) == [[a, b] for a, b in zip(rectangle, rectangle[1:])]
+
+
+def test_arc_data_direction():
+    counter_clockwise = arc_data([1, 0, 2], [0, 1, 2], [-1, 0, 2])
+    clockwise = arc_data([-1, 0, 2], [0, 1, 2], [1, 0, 2])
+
+    for arc in (counter_clockwise, clockwise):
+        assert abs(arc["radius"] - 1) < 1e-9
+        assert abs(arc["angleRadians"] - pi) < 1e-9
+        assert abs(arc["length"] - pi) < 1e-9
+        assert arc["startPoint"]["z"] == 2
+    assert counter_clockwise["plane"]["normal"]["z"] == 1.0
+    assert clockwise["plane"]["normal"]["z"] == -1.0
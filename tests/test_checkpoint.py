@@ -0,0 +1,162 @@
+"""Tests for checkpointed, resumable conversion runs."""
+
+from Checkpoint import ConversionCheckpoint
+from main import FunctionInputs, SketchUp_to_Revit
+from tests.fake_speckle_server import (
+    FakeSpeckleServer,
+    fake_automation_context,
+    generate_model,
+)
+
+INPUTS = {"tolerance": 1e-6, "reference_level": "Level 0"}
+
+
+def checkpoint(directory, inputs: dict = INPUTS) -> ConversionCheckpoint:
+    return ConversionCheckpoint(str(directory), "version", inputs, interval=0.0)
+
+
+def add(checkpoint: ConversionCheckpoint, position: int) -> None:
+    checkpoint.add(position, f"id-{position}", walls=[{"wall": position}], columns=[])
+
+
+def test_load_returns_saved_records(tmp_path):
+    first = checkpoint(tmp_path)
+    assert first.load() == (0, [])
+    for position in range(3):
+        add(first, position)
+    first.save(3)
+
+    position, entries = checkpoint(tmp_path).load()
+    assert position == 3
+    assert [entry["source_id"] for entry in entries] == ["id-0", "id-1", "id-2"]
+    assert entries[1]["walls"] == [{"wall": 1}]
+
+
+def test_resume_after_interrupt_drops_unsaved_records(tmp_path):
+    interrupted = checkpoint(tmp_path)
+    for position in range(2):
+        add(interrupted, position)
+    interrupted.save(2)
+    add(interrupted, 2)  # Converted, but the run died before the next save
+    interrupted._records.flush()
+
+    resumed = checkpoint(tmp_path)
+    position, entries = resumed.load()
+    assert position == 2 and len(entries) == 2
+
+    # Element 2 is converted again and appended once
+    add(resumed, 2)
+    resumed.save(3)
+    position, entries = checkpoint(tmp_path).load()
+    assert [entry["position"] for entry in entries] == [0, 1, 2]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    first = checkpoint(tmp_path)
+    for position in range(2):
+        add(first, position)
+    first.save(2)
+    with open(first.records_path, "a", encoding="utf-8") as file:
+        file.write('{"position": 2, "source_id": "id-')
+
+    position, entries = checkpoint(tmp_path).load()
+    assert position == 2 and len(entries) == 2
+
+
+def test_changed_inputs_do_not_resume(tmp_path):
+    first = checkpoint(tmp_path)
+    add(first, 0)
+    first.save(1)
+
+    changed = checkpoint(tmp_path, {**INPUTS, "tolerance": 1e-3})
+    assert changed.key != first.key
+    assert changed.load() == (0, [])
+
+
+def test_outcomes_are_restored(tmp_path):
+    from shapely import Polygon
+
+    first = checkpoint(tmp_path)
+    first.add(
+        0,
+        "id-0",
+        walls=[],
+        columns=[],
+        degraded=True,
+        errors=[{"Error": "failed", "Base Polygon": Polygon()}],
+        vertex_count=8,
+        duration=0.5,
+    )
+    first.save(1)
+
+    (entry,) = checkpoint(tmp_path).load()[1]
+    assert entry["degraded"] is True
+    assert entry["errors"] == [{"Error": "failed", "Base Polygon": "POLYGON EMPTY"}]
+    assert (entry["vertex_count"], entry["duration"]) == (8, 0.5)
+
+
+def test_shifted_elements_do_not_resume(tmp_path):
+    first = checkpoint(tmp_path)
+    for position in range(2):
+        add(first, position)
+    first.save(2)
+
+    elements = [{"id": f"id-{position}"} for position in range(4)]
+    assert checkpoint(tmp_path).load(elements)[0] == 2
+    # An element was left out of the received model, positions no longer match
+    assert checkpoint(tmp_path).load(elements[1:]) == (0, [])
+
+
+def test_run_reports_timings_with_and_without_checkpoints(tmp_path):
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(40))
+
+        for inputs in ({}, {"checkpoint_directory": str(tmp_path)}):
+            automate_context = fake_automation_context(server, version_id)
+            SketchUp_to_Revit(automate_context, FunctionInputs(**inputs))
+
+            assert automate_context.run_status.value == "SUCCEEDED"
+            assert "Slowest" in automate_context._automation_result.status_message
+
+    assert not any(tmp_path.iterdir())  # Cleared once the version exists
+
+
+def test_resumed_run_reports_restored_errors_and_degraded_elements(
+    tmp_path, monkeypatch
+):
+    import Converter
+
+    convert_element = Converter.convert_element
+    converted = []
+
+    def interrupted(element, vertices, function_inputs):
+        if len(converted) == 5:
+            raise RuntimeError("worker was killed")
+        result = convert_element(element, vertices, function_inputs)
+        if not converted:
+            result["degraded"] = True
+        elif len(converted) == 1:
+            result["errors"] = [{"Error": "failed", "Element": element["id"]}]
+        converted.append(element["id"])
+        return result
+
+    inputs = {"checkpoint_directory": str(tmp_path), "checkpoint_interval": 1e-6}
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(40))
+
+        monkeypatch.setattr(Converter, "convert_element", interrupted)
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(automate_context, FunctionInputs(**inputs))
+        assert automate_context.run_status.value == "FAILED"
+
+        monkeypatch.setattr(Converter, "convert_element", convert_element)
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(automate_context, FunctionInputs(**inputs))
+
+    result = automate_context._automation_result
+    # The element that failed before the checkpoint still fails the resumed run
+    assert result.run_status.value == "EXCEPTION"
+    warnings = [
+        case for case in result.object_results if case.category == "Degraded elements"
+    ]
+    assert warnings and warnings[0].object_ids == [converted[0]]
@@ -0,0 +1,108 @@
+"""Tests for the removal of duplicated and overlapping elements."""
+
+import pytest
+
+from Deduplicate import drop_duplicate_elements, element_footprint
+
+
+def prism(id: str, outline: list, category: int = 107, z0=0.0, z1=3000.0) -> dict:
+    """DirectShape with a bottom and top n-gon face and quad sides."""
+
+    n = len(outline)
+    vertices = []
+    for z in (z0, z1):
+        for x, y in outline:
+            vertices += [float(x), float(y), z]
+    faces = [n, *range(n), n, *range(n, 2 * n)]
+    for i in range(n):
+        j = (i + 1) % n
+        faces += [4, i, j, n + j, n + i]
+
+    return {
+        "id": id,
+        "speckle_type": "Objects.BuiltElements.Revit.DirectShape",
+        "category": category,
+        "baseGeometries": [{"vertices": vertices, "faces": faces}],
+    }
+
+
+def box(id: str, x: float = 0.0, category: int = 107) -> dict:
+    return prism(id, [(x, 0), (x + 4000, 0), (x + 4000, 200), (x, 200)], category)
+
+
+def test_footprint_of_a_non_star_shaped_face():
+    # Seen from its first vertex, this L-shaped face's far corner is hidden, fan
+    # triangles from that vertex would cover part of the notch
+    outline = [(2, 0), (2, 1), (1, 1), (1, 2), (0, 2), (0, 0)]
+    footprint, z_min, z_max = element_footprint(prism("l", outline))
+
+    assert footprint.area == pytest.approx(3.0)
+    assert (z_min, z_max) == (0.0, 3000.0)
+
+
+def test_exact_duplicate_is_dropped():
+    kept, dropped = drop_duplicate_elements([box("a"), box("b"), box("c", x=10000)])
+
+    assert [element["id"] for element in kept] == ["a", "c"]
+    assert dropped == [{"id": "b", "kept_id": "a", "reason": "duplicate", "overlap": 1.0}]
+
+
+def test_shifted_overlap_against_the_threshold():
+    # Shifted by 1% of the length, 99% of the footprint is shared
+    kept, dropped = drop_duplicate_elements([box("a"), box("b", x=40)], overlap_threshold=0.95)
+    assert [element["id"] for element in kept] == ["a"]
+    assert dropped[0]["reason"] == "overlap"
+    assert dropped[0]["overlap"] == pytest.approx(0.99)
+
+    # Shifted by 10%, 90% is shared
+    kept, dropped = drop_duplicate_elements([box("a"), box("b", x=400)], overlap_threshold=0.95)
+    assert [element["id"] for element in kept] == ["a", "b"]
+    assert dropped == []
+
+
+def test_different_categories_are_not_merged():
+    wall, column = box("wall", category=107), box("column", category=90)
+    kept, dropped = drop_duplicate_elements([wall, column])
+
+    assert kept == [wall, column]
+    assert dropped == []
+
+
+def test_elements_without_vertices_are_skipped():
+    no_meshes = {**box("no-meshes"), "baseGeometries": []}
+    no_vertices = {
+        **box("no-vertices"),
+        "baseGeometries": [{"vertices": [], "faces": []}],
+    }
+    elements = [box("a"), no_meshes, no_vertices, box("b")]
+
+    kept, dropped = drop_duplicate_elements(elements)
+
+    assert kept == [box("a"), no_meshes, no_vertices]
+    assert [record["id"] for record in dropped] == ["b"]
+
+
+def test_run_with_a_wall_without_vertices():
+    from specklepy.objects.geometry import Mesh
+
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        DirectShape,
+        FakeSpeckleServer,
+        fake_automation_context,
+        generate_model,
+    )
+
+    model = generate_model(20)
+    empty = DirectShape(category=107, name="", units="mm")
+    empty.baseGeometries = [Mesh(vertices=[], faces=[], units="mm")]
+    model.elements.append(empty)
+
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(model)
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(automate_context, FunctionInputs(deduplicate_elements=True))
+
+    assert automate_context.run_status.value == "SUCCEEDED", (
+        automate_context._automation_result.status_message
+    )
@@ -0,0 +1,81 @@
+"""Tests for the streaming NDJSON and columnar NumPy export."""
+
+import numpy as np
+
+from Export import ElementExporter, iter_ndjson, load_columns
+from RevitColumn import revit_column_data
+from RevitWall import revit_wall_data
+
+
+def test_round_trip(tmp_path):
+    wall = revit_wall_data(3000.0, [0.0, 0.0, 0.0], [4000.0, 0.0, 0.0], 4000.0)
+    column = revit_column_data(
+        [5000.0, 0.0, 0.0], [5000.0, 0.0, 2700.0], 2700.0, rotation=45.0
+    )
+    arc_wall = revit_wall_data(
+        3600.0,
+        [0.0, 0.0, 0.0],
+        [2000.0, 2000.0, 0.0],
+        3141.59,
+        type="Wall-Ext_102Bwk-75Ins-100LBlk-12P",
+        baseLine_mid=[2000.0 - 2000.0 / 2**0.5, 2000.0 / 2**0.5, 0.0],
+    )
+    records = [wall, column, arc_wall]
+
+    with ElementExporter(str(tmp_path / "export" / "version"), flush_every=2) as exporter:
+        for i, record in enumerate(records):
+            exporter.write(record, source_id=f"sketchup-{i}")
+
+    assert list(iter_ndjson(exporter.ndjson_path)) == [
+        (f"sketchup-{i}", record) for i, record in enumerate(records)
+    ]
+
+    table = load_columns(exporter.npz_path)
+    assert list(table["source_id"]) == ["sketchup-0", "sketchup-1", "sketchup-2"]
+    assert list(table["id"]) == [record["id"] for record in records]
+    np.testing.assert_allclose(table["start"], [[0, 0, 0], [5000, 0, 0], [0, 0, 0]])
+    np.testing.assert_allclose(
+        table["end"], [[4000, 0, 0], [5000, 0, 2700], [2000, 2000, 0]]
+    )
+    np.testing.assert_allclose(table["height"], [3000.0, 2700.0, 3600.0])
+    np.testing.assert_allclose(table["rotation"], [0.0, 45.0, 0.0])
+    assert list(table["curved"]) == [False, False, True]
+    assert list(table["slanted"]) == [False, False, False]
+    assert [table["types"][i] for i in table["type_index"]] == [
+        record["type"] for record in records
+    ]
+    assert [table["categories"][i] for i in table["category_index"]] == [
+        record["category"] for record in records
+    ]
+
+
+def test_failed_run_keeps_its_export(tmp_path, monkeypatch):
+    import Converter
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        FakeSpeckleServer,
+        fake_automation_context,
+        generate_model,
+    )
+
+    convert_element = Converter.convert_element
+    converted = []
+
+    def convert_then_fail(*args, **kwargs):
+        if len(converted) == 5:
+            raise MemoryError("worker ran out of memory")
+        converted.append(args[0]["id"])
+        return convert_element(*args, **kwargs)
+
+    monkeypatch.setattr(Converter, "convert_element", convert_then_fail)
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(20))
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(
+            automate_context, FunctionInputs(export_directory=str(tmp_path))
+        )
+
+    assert automate_context.run_status.value == "FAILED"
+    rows = list(iter_ndjson(tmp_path / f"{version_id}.ndjson"))
+    assert rows and {source_id for source_id, _ in rows} <= set(converted)
+    assert len(load_columns(tmp_path / f"{version_id}.npz")["id"]) == len(rows)
@@ -0,0 +1,161 @@
+"""Load test of the full SketchUp_to_Revit path against the local Speckle server stand-in.
+
+Model sizes come from the LOAD_TEST_SIZES environment variable (comma separated element
+counts, e.g. "100,1000,10000,100000"), and the per-request latency in seconds from
+LOAD_TEST_LATENCY. Each size runs in a fresh process. The server and the generated model
+live in that process too, so the reported memory is the peak RSS during the
+SketchUp_to_Revit call above the RSS just before it. Run with
+`pytest -s tests/test_load.py` to see the report.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+LOAD_TEST_SIZES = [
+    int(size) for size in os.environ.get("LOAD_TEST_SIZES", "20,200").split(",")
+]
+LOAD_TEST_LATENCY = float(os.environ.get("LOAD_TEST_LATENCY", "0.005"))
+
+
+def memory_status() -> tuple[float, float]:
+    """(current, peak) RSS of this process in MB, from /proc/self/status."""
+
+    values = {}
+    with open("/proc/self/status", encoding="utf-8") as file:
+        for line in file:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "VmHWM"):
+                values[name] = int(value.split()[0]) / 1024
+    return values["VmRSS"], values["VmHWM"]
+
+
+def reset_peak_rss() -> None:
+    """Resets the peak RSS (VmHWM) of this process to its current RSS, Linux only."""
+
+    with open("/proc/self/clear_refs", "w", encoding="utf-8") as file:
+        file.write("5")
+
+
+def run_load(element_count: int, latency: float, input_overrides: dict) -> dict:
+    """Converts a generated model of `element_count` elements and returns the run metrics."""
+
+    from time import perf_counter
+
+    from speckle_automate import AutomationStatus
+
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        FakeSpeckleServer,
+        fake_automation_context,
+        generate_model,
+    )
+
+    with FakeSpeckleServer(latency=latency) as server:
+        version_id = server.add_model(generate_model(element_count))
+        source_objects = len(server.objects)
+        automate_context = fake_automation_context(server, version_id)
+
+        # Measure the run only, not the server and model held by this process
+        reset_peak_rss()
+        rss_before, _ = memory_status()
+        start = perf_counter()
+        SketchUp_to_Revit(automate_context, FunctionInputs(**input_overrides))
+        duration = perf_counter() - start
+        _, peak_rss = memory_status()
+
+        result_versions = automate_context._automation_result.result_versions
+        converted = 0
+        if result_versions:
+            import json
+
+            root = json.loads(
+                server.objects[server.versions[result_versions[0]]["referencedObject"]]
+            )
+            converted = len(root["data"])
+
+    return {
+        "elements": element_count,
+        "status": automate_context.run_status,
+        "succeeded": automate_context.run_status == AutomationStatus.SUCCEEDED,
+        "converted": converted,
+        "duration": duration,
+        "throughput": element_count / duration,
+        "run_rss_mb": peak_rss - rss_before,
+        "source_objects": source_objects,
+        **server.stats,
+    }
+
+
+def run_in_fresh_process(element_count: int, input_overrides: dict) -> dict:
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(
+            run_load, element_count, LOAD_TEST_LATENCY, input_overrides
+        ).result()
+
+
+def report(metrics: list[dict]) -> str:
+    lines = [
+        f"{'elements':>9} {'walls+cols':>10} {'seconds':>8} {'elem/s':>8} {'run MB':>8} "
+        f"{'down MB':>8} {'down obj':>9} {'up MB':>7} {'up obj':>7} {'requests':>8}"
+    ]
+    for m in metrics:
+        lines.append(
+            f"{m['elements']:>9} {m['converted']:>10} {m['duration']:>8.2f} "
+            f"{m['throughput']:>8.1f} {m['run_rss_mb']:>8.1f} "
+            f"{m['bytes_downloaded'] / 1e6:>8.2f} {m['objects_downloaded']:>9} "
+            f"{m['bytes_uploaded'] / 1e6:>7.2f} {m['objects_uploaded']:>7} {m['requests']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def test_load_full_receive():
+    """Full receive, serial conversion."""
+
+    metrics = [
+        run_in_fresh_process(size, {"selective_receive": False})
+        for size in LOAD_TEST_SIZES
+    ]
+    print("\nFull receive\n" + report(metrics))
+
+    for m in metrics:
+        assert m["succeeded"], m["status"]
+        assert m["converted"] > 0
+        assert m["objects_downloaded"] == m["source_objects"]
+        assert m["bytes_uploaded"] > 0
+
+
+def test_load_selective_receive():
+    """Selective receive skips the furniture meshes but converts the same elements."""
+
+    full = run_in_fresh_process(LOAD_TEST_SIZES[0], {"selective_receive": False})
+    metrics = [
+        run_in_fresh_process(size, {"selective_receive": True})
+        for size in LOAD_TEST_SIZES
+    ]
+    print("\nSelective receive\n" + report(metrics))
+
+    for m in metrics:
+        assert m["succeeded"], m["status"]
+    assert metrics[0]["converted"] == full["converted"]
+    assert metrics[0]["bytes_downloaded"] < full["bytes_downloaded"]
+
+
+def test_model_served_from_local_disk(tmp_path):
+    """A saved server runs its versions again without adding the model."""
+
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        FakeSpeckleServer,
+        fake_automation_context,
+        generate_model,
+    )
+
+    with FakeSpeckleServer(storage_dir=str(tmp_path)) as server:
+        version_id = server.add_model(generate_model(20))
+        server.save()
+
+    with FakeSpeckleServer(storage_dir=str(tmp_path)) as server:
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(automate_context, FunctionInputs())
+
+    assert automate_context.run_status.value == "SUCCEEDED"
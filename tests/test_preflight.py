@@ -0,0 +1,138 @@
+"""Tests for the preflight scan, the execution plan and the run budgets."""
+
+import pytest
+
+import Preflight
+from Preflight import (
+    COST_MODEL,
+    PARALLEL_THRESHOLD,
+    calibrate_cost_model,
+    element_cost,
+    plan_run,
+    scan_elements,
+)
+from main import FunctionInputs, PreflightMode, SketchUp_to_Revit
+from tests.fake_speckle_server import (
+    FakeSpeckleServer,
+    fake_automation_context,
+    generate_model,
+)
+
+DIRECT_SHAPE = "Objects.BuiltElements.Revit.DirectShape"
+
+
+def element(category: int, vertex_count: int) -> dict:
+    return {
+        "speckle_type": DIRECT_SHAPE,
+        "category": category,
+        "baseGeometries": [{"vertices": [0.0] * 3 * vertex_count}],
+    }
+
+
+def test_scan_counts_per_category():
+    elements = [
+        element(107, 8),
+        element(107, 12),
+        element(90, 8),
+        {"speckle_type": "Base", "category": 107},
+    ]
+    scan = scan_elements(elements)
+
+    assert scan["Walls"]["elements"] == 2
+    assert scan["Walls"]["vertices"] == 20
+    assert scan["Walls"]["max_vertices"] == 12
+    assert scan["Walls"]["seconds"] == element_cost("Walls", 8) + element_cost("Walls", 12)
+    assert scan["StructuralColumns"]["elements"] == 1
+
+
+def test_scan_reads_received_base_objects():
+    import json
+
+    from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+
+    model = generate_model(20)
+    serialized = json.loads(BaseObjectSerializer().write_json(model)[1])["elements"]
+
+    scanned = scan_elements(model.elements)
+    assert sum(entry["elements"] for entry in scanned.values()) == 20
+    assert scanned == scan_elements(serialized)
+
+
+def test_plan_is_serial_for_small_models():
+    plan = plan_run(scan_elements([element(107, 8)] * 10), max_workers=8)
+
+    assert plan["workers"] == 1
+    assert plan["elements"] == 10
+    assert plan["seconds"] == plan["serial_seconds"]
+
+
+def test_plan_goes_parallel_for_heavy_models(monkeypatch):
+    monkeypatch.setattr(Preflight, "available_cpus", lambda: 16)
+    heavy = [element(107, 2000)] * 200
+    scan = scan_elements(heavy)
+    assert scan["Walls"]["seconds"] > PARALLEL_THRESHOLD
+
+    plan = plan_run(scan, max_workers=4)
+    assert plan["workers"] == 4
+    assert plan["vertex_store"]
+    assert plan["seconds"] < plan["serial_seconds"]
+    assert 1 <= plan["chunk_size"] <= 200 // 16
+
+
+def test_plan_never_uses_more_workers_than_cpus(monkeypatch):
+    scan = scan_elements([element(107, 2000)] * 200)
+
+    monkeypatch.setattr(Preflight, "available_cpus", lambda: 2)
+    assert plan_run(scan)["workers"] == 2
+    assert plan_run(scan, max_workers=8)["workers"] == 2
+
+    monkeypatch.setattr(Preflight, "available_cpus", lambda: 16)
+    assert plan_run(scan, max_workers=3)["workers"] == 3
+
+
+def test_available_cpus_follows_the_affinity():
+    import os
+
+    assert 1 <= Preflight.available_cpus() <= len(os.sched_getaffinity(0))
+
+
+def test_calibration_fits_measured_timings():
+    records = [
+        {"category": "Walls", "vertex_count": n, "duration": 0.01 + 1e-4 * n}
+        for n in (8, 100, 500, 1000, 2000)
+    ]
+    calibrated = calibrate_cost_model(records)
+
+    assert calibrated["Walls"]["intercept"] == pytest.approx(0.01, rel=1e-3)
+    assert calibrated["Walls"]["linear"] == pytest.approx(1e-4, rel=1e-3)
+    assert calibrated["Columns"] == COST_MODEL["Columns"]  # Too few records to refit
+
+
+def test_runtime_budget_aborts_before_converting():
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(50))
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(
+            automate_context,
+            FunctionInputs(preflight_mode=PreflightMode.REPORT, runtime_budget=1e-6),
+        )
+
+    assert automate_context.run_status.value == "FAILED"
+    assert "Preflight aborted the run" in automate_context._automation_result.status_message
+    assert not automate_context._automation_result.result_versions
+
+
+def test_runs_with_telemetry_feed_the_calibration(tmp_path):
+    from Telemetry import read_element_timings
+
+    path = str(tmp_path / "telemetry.jsonl")
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(50))
+        SketchUp_to_Revit(
+            fake_automation_context(server, version_id),
+            FunctionInputs(telemetry_path=path),
+        )
+
+    timings = read_element_timings(path)
+    assert {record["category"] for record in timings} >= {"Walls"}
+    assert calibrate_cost_model(timings)["Walls"] != COST_MODEL["Walls"]
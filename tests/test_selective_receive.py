@@ -0,0 +1,58 @@
+"""Tests for the partial receive of a version over the server transport."""
+
+import json
+
+import SelectiveReceive
+from SelectiveReceive import fetch_objects, receive_version_selective
+from tests.fake_speckle_server import (
+    DirectShape,
+    FakeSpeckleServer,
+    fake_automation_context,
+    generate_model,
+)
+
+
+def test_fetch_objects_batches_requests(monkeypatch):
+    from specklepy.transports.server import ServerTransport
+
+    monkeypatch.setattr(SelectiveReceive, "FETCH_BATCH_SIZE", 2)
+    with FakeSpeckleServer() as server:
+        server.add_model(generate_model(3))
+        ids = sorted(server.objects)[:5]
+        version_id = next(iter(server.versions))
+        client = fake_automation_context(server, version_id).speckle_client
+        transport = ServerTransport("project", client)
+
+        server.reset_stats()
+        objects = fetch_objects(transport, ids + ["missing"])
+
+        assert server.stats["requests"] == 3  # 6 ids in batches of 2
+        assert objects == {id: server.objects[id] for id in ids}
+
+
+def test_received_bytes_are_utf8_bytes():
+    from specklepy.objects.geometry import Mesh
+    from specklepy.objects.other import Collection
+
+    wall = DirectShape(category=107, name="Mur extérieur – béton", units="mm")
+    wall.baseGeometries = [
+        Mesh(
+            vertices=[0.0, 0.0, 0.0, 4000.0, 0.0, 0.0, 4000.0, 200.0, 0.0, 0.0, 200.0, 0.0],
+            faces=[4, 0, 1, 2, 3],
+            units="mm",
+        )
+    ]
+    model = Collection(name="Sketchup Model", collectionType="model", elements=[wall])
+
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(model)
+        # Servers send the names unescaped, as UTF-8
+        for id, obj in server.objects.items():
+            server.objects[id] = json.dumps(json.loads(obj), ensure_ascii=False)
+        automate_context = fake_automation_context(server, version_id)
+        _, stats = receive_version_selective(automate_context, {"Walls"})
+
+    # Every object of the model is received, the wall is converted
+    assert stats["objects"] == len(server.objects)
+    assert stats["bytes"] == sum(len(obj.encode("utf-8")) for obj in server.objects.values())
+    assert stats["bytes"] > sum(len(obj) for obj in server.objects.values())
@@ -0,0 +1,170 @@
+"""Tests for spatial sharding, from the manifest to the merged version."""
+
+import json
+
+import pytest
+
+from main import FunctionInputs, SketchUp_to_Revit, ShardMode
+from Sharding import build_manifest, merge_shards, stream_merged
+from Speckle_SketchUp_mapper import is_convertible
+from tests.fake_speckle_server import (
+    FakeSpeckleServer,
+    fake_automation_context,
+    generate_model,
+)
+
+
+def serialized_elements(element_count: int) -> list:
+    from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+
+    model = generate_model(element_count)
+    return json.loads(BaseObjectSerializer().write_json(model)[1])["elements"]
+
+
+def converted_baselines(server: FakeSpeckleServer, automate_context) -> list:
+    """(category, start, end) of every element of the version the run created, in order."""
+
+    result_versions = automate_context._automation_result.result_versions
+    root = json.loads(
+        server.objects[server.versions[result_versions[-1]]["referencedObject"]]
+    )
+    baselines = []
+    for data in root["data"]:
+        baseLine = data["baseLine"]
+        start = baseLine.get("start") or baseLine["startPoint"]
+        end = baseLine.get("end") or baseLine["endPoint"]
+        baselines.append(
+            (data["category"], *(start[k] for k in "xyz"), *(end[k] for k in "xyz"))
+        )
+    return baselines
+
+
+def test_every_element_has_one_owner():
+    elements = serialized_elements(300)
+    manifest = build_manifest(elements, 5, "version", {})
+
+    positions = [p for shard in manifest["shards"] for p in shard["positions"]]
+    assert len(manifest["shards"]) == 5
+    # Furniture is never converted and has no owner
+    assert sorted(positions) == [
+        p for p, element in enumerate(elements) if is_convertible(element)
+    ]
+    assert all(shard["positions"] for shard in manifest["shards"])
+    assert build_manifest(elements, 5, "version", {}) == manifest
+
+
+def test_elements_without_vertices_are_skipped():
+    elements = serialized_elements(30)
+    walls = [p for p, element in enumerate(elements) if element["category"] == 107]
+    elements[walls[0]]["baseGeometries"] = []
+    elements[walls[1]]["baseGeometries"][0]["vertices"] = []
+    manifest = build_manifest(elements, 3, "version", {})
+
+    positions = [p for shard in manifest["shards"] for p in shard["positions"]]
+    assert sorted(positions) == [
+        p for p, element in enumerate(elements) if is_convertible(element)
+    ]
+    assert walls[0] not in positions and walls[1] not in positions
+
+
+def test_stream_merged_yields_in_model_order():
+    manifest = {
+        "shards": [
+            {"index": 0, "positions": [0, 2], "ids": ["a", "c"]},
+            {"index": 1, "positions": [1, 3], "ids": ["b", "d"]},
+        ]
+    }
+    a, b, c, d = ({"position": p, "source_id": id} for p, id in enumerate("abcd"))
+
+    merged = stream_merged(manifest, iter([[b, d], [a, c]]), [0, 1, 2, 3])
+    assert [record["source_id"] for record in merged] == ["a", "b", "c", "d"]
+    # Positions restored from a checkpoint are not yielded again
+    merged = stream_merged(manifest, iter([[b, d], [a, c]]), [2, 3])
+    assert [record["source_id"] for record in merged] == ["c", "d"]
+    with pytest.raises(ValueError, match="more than one shard"):
+        list(stream_merged(manifest, iter([[a, c], [b, d], [d]]), [0, 1, 2, 3]))
+    with pytest.raises(ValueError, match="not converted"):
+        list(stream_merged(manifest, iter([[a, c], [b]]), [0, 1, 2, 3]))
+
+
+def test_merge_rejects_duplicated_and_missing_elements():
+    manifest = {
+        "shards": [
+            {"index": 0, "positions": [0, 2], "ids": ["a", "c"]},
+            {"index": 1, "positions": [1], "ids": ["b"]},
+        ]
+    }
+    a, b, c = ({"position": p, "source_id": id} for p, id in enumerate("abc"))
+
+    assert list(sorted(merge_shards(manifest, [[a, c], [b]]))) == [0, 1, 2]
+    with pytest.raises(ValueError, match="more than one shard"):
+        merge_shards(manifest, [[a, c], [b, c]])
+    with pytest.raises(ValueError, match="not converted"):
+        merge_shards(manifest, [[a], [b]])
+    assert list(merge_shards(manifest, [[c], []], start=2)) == [2]
+
+
+def test_sharded_runs_match_a_single_run(tmp_path):
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(300))
+
+        def run(**inputs):
+            automate_context = fake_automation_context(server, version_id)
+            SketchUp_to_Revit(automate_context, FunctionInputs(**inputs))
+            assert automate_context.run_status.value == "SUCCEEDED", (
+                automate_context._automation_result.status_message
+            )
+            return automate_context
+
+        expected = converted_baselines(server, run())
+
+        local = run(shard_mode=ShardMode.LOCAL, shard_count=3, parallel_workers=2)
+        assert converted_baselines(server, local) == expected
+        local = run(
+            shard_mode=ShardMode.LOCAL,
+            shard_count=3,
+            checkpoint_directory=str(tmp_path / "checkpoints"),
+        )
+        assert converted_baselines(server, local) == expected
+
+        shards = {"shard_count": 3, "shard_directory": str(tmp_path)}
+        run(shard_mode=ShardMode.PLAN, **shards)
+        for index in range(3):
+            run(shard_mode=ShardMode.CONVERT, shard_index=index, **shards)
+        merged = run(shard_mode=ShardMode.MERGE, **shards)
+        assert converted_baselines(server, merged) == expected
+
+
+def test_wall_without_vertices_is_skipped_by_every_mode(tmp_path):
+    from specklepy.objects.geometry import Mesh
+
+    from tests.fake_speckle_server import DirectShape
+
+    model = generate_model(30)
+    empty = DirectShape(category=107, name="", units="mm")
+    empty.baseGeometries = [Mesh(vertices=[], faces=[], units="mm")]
+    model.elements.insert(15, empty)
+
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(model)
+
+        def run(**inputs):
+            automate_context = fake_automation_context(server, version_id)
+            SketchUp_to_Revit(
+                automate_context, FunctionInputs(deduplicate_elements=False, **inputs)
+            )
+            assert automate_context.run_status.value == "SUCCEEDED", (
+                automate_context._automation_result.status_message
+            )
+            return automate_context
+
+        expected = converted_baselines(server, run())
+        local = run(shard_mode=ShardMode.LOCAL, shard_count=3)
+        assert converted_baselines(server, local) == expected
+
+        shards = {"shard_count": 3, "shard_directory": str(tmp_path)}
+        run(shard_mode=ShardMode.PLAN, **shards)
+        for index in range(3):
+            run(shard_mode=ShardMode.CONVERT, shard_index=index, **shards)
+        merged = run(shard_mode=ShardMode.MERGE, **shards)
+        assert converted_baselines(server, merged) == expected
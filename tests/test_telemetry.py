@@ -0,0 +1,95 @@
+"""Tests for the run telemetry store and regression detection."""
+
+from main import FunctionInputs, SketchUp_to_Revit
+from Telemetry import compare, detect_regressions, read_records
+from tests.fake_speckle_server import (
+    FakeSpeckleServer,
+    fake_automation_context,
+    generate_model,
+)
+
+
+def run_record(elements: int, duration: float, convert: float, **fields) -> dict:
+    return {
+        "kind": "conversion",
+        "status": "succeeded",
+        "elements": elements,
+        "duration": duration,
+        "stages": {"receive": duration - convert, "convert": convert},
+        **fields,
+    }
+
+
+def test_slowdown_against_similar_sized_runs():
+    history = [
+        run_record(1000 + 10 * i, 10.0 + 0.1 * (i % 3), 8.0 + 0.1 * (i % 3))
+        for i in range(10)
+    ]
+
+    assert detect_regressions(history, run_record(1050, 10.1, 8.1)) == []
+
+    regressions = detect_regressions(history, run_record(1050, 14.0, 12.0))
+    assert {r["metric"] for r in regressions} == {"duration", "convert"}
+    assert all(r["slowdown"] > 0.3 for r in regressions)
+
+    # A model ten times larger has no baseline yet
+    assert detect_regressions(history, run_record(10000, 140.0, 120.0)) == []
+    # Neither do failed runs
+    failed = [{**run, "status": "failed"} for run in history]
+    assert detect_regressions(failed, run_record(1050, 14.0, 12.0)) == []
+
+
+def test_runs_are_recorded(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(100))
+        for _ in range(2):
+            SketchUp_to_Revit(
+                fake_automation_context(server, version_id),
+                FunctionInputs(telemetry_path=str(path)),
+            )
+
+    records = read_records(str(path))
+    assert len(records) == 2
+    record = records[-1]
+    assert record["status"] == "succeeded"
+    assert record["version_id"] == version_id
+    assert record["elements"] == 100
+    assert sum(c["elements"] for c in record["categories"].values()) == (
+        record["received_elements"]
+    )
+    assert record["converted_elements"] > 0 and record["vertices"] > 0
+    assert record["output_objects"] > 0 and record["output_bytes"] > 0
+    assert record["peak_memory_bytes"] > 0
+    assert {"receive", "parse", "convert", "send"} <= set(record["stages"])
+    assert compare(str(path), last=2)[-1] == (record, [])
+
+
+def test_failed_receive_is_recorded(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(10))
+        server.objects.pop(server.versions[version_id]["referencedObject"])
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(automate_context, FunctionInputs(telemetry_path=str(path)))
+
+    assert automate_context.run_status.value == "FAILED"
+    (record,) = read_records(str(path))
+    assert record["status"] == "failed"
+    assert record["stages"] == {}
+
+
+def test_timing_sample_skips_degraded_and_spreads_vertex_counts():
+    from Telemetry import timing_sample
+
+    records = [
+        {"category": "Walls", "vertex_count": n, "duration": n / 1000, "degraded": False}
+        for n in range(100)
+    ] + [{"category": "Walls", "vertex_count": 10**6, "duration": 5.0, "degraded": True}]
+
+    sample = timing_sample(records, size=10)
+    assert len(sample) == 10
+    assert [vertex_count for _, vertex_count, _ in sample] == list(range(0, 100, 10))
+    assert all(category == "Walls" for category, _, _ in sample)
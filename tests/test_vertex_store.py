@@ -0,0 +1,131 @@
+"""Tests for the memory-mapped vertex store shared with worker processes."""
+
+import pickle
+
+import numpy as np
+
+from VertexStore import VertexStore
+
+MESHES = [
+    {"vertices": [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 0.0], "faces": [3, 0, 1, 2]},
+    {"vertices": [5.0, 5.0, 5.0], "faces": []},
+    {"vertices": [2.0, 2.0, 2.0, 3.0, 3.0, 3.0]},
+]
+
+
+def test_round_trip(tmp_path):
+    store = VertexStore.build(MESHES, str(tmp_path / "model.vertices"))
+
+    assert len(store) == 3
+    for slot, mesh in enumerate(MESHES):
+        np.testing.assert_array_equal(
+            store.vertices(slot), np.reshape(mesh["vertices"], (-1, 3))
+        )
+    np.testing.assert_array_equal(store.faces(0), [3, 0, 1, 2])
+    assert store.faces(1).size == 0 and store.faces(2).size == 0
+    assert not store.vertices(0).flags.writeable
+
+    store.close(delete=True)
+    assert not (tmp_path / "model.vertices").exists()
+
+
+def test_pickle_attaches_to_the_same_file(tmp_path):
+    store = VertexStore.build(MESHES, str(tmp_path / "model.vertices"))
+    payload = pickle.dumps(store)
+
+    # Only the path and index are sent, not the geometry
+    assert len(payload) < 1000
+    attached = pickle.loads(payload)
+    assert attached.path == store.path
+    np.testing.assert_array_equal(attached.vertices(2), store.vertices(2))
+
+
+def test_empty_store(tmp_path):
+    store = VertexStore.build([], str(tmp_path / "empty.vertices"))
+
+    assert len(store) == 0
+    store.close(delete=True)
+    assert not (tmp_path / "empty.vertices").exists()
+
+
+def test_parallel_run_without_convertible_elements_cleans_up(tmp_path):
+    from specklepy.objects.geometry import Mesh
+    from specklepy.objects.other import Collection
+
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        DirectShape,
+        FakeSpeckleServer,
+        fake_automation_context,
+    )
+
+    table = DirectShape(category=46, name="Table", units="mm")
+    table.baseGeometries = [Mesh(vertices=MESHES[0]["vertices"], faces=[3, 0, 1, 2])]
+    model = Collection(name="Sketchup Model", collectionType="model", elements=[table])
+
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(model)
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(
+            automate_context,
+            # Selective receive leaves the table out, nothing is left to convert
+            FunctionInputs(parallel_workers=2, vertex_store_directory=str(tmp_path)),
+        )
+
+    assert not list(tmp_path.glob("*.vertices"))
+
+
+def test_parallel_run_only_stores_converted_categories(tmp_path, monkeypatch):
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        FakeSpeckleServer,
+        fake_automation_context,
+        generate_model,
+    )
+
+    stored = []
+    build = VertexStore.build
+
+    def record_build(meshes, path, release=False):
+        stored.extend(len(mesh["vertices"]) // 3 for mesh in meshes)
+        return build(meshes, path, release)
+
+    monkeypatch.setattr(VertexStore, "build", record_build)
+    model = generate_model(40)
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(model)
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(
+            automate_context,
+            # The furniture is received too, but must not reach the workers
+            FunctionInputs(parallel_workers=2, selective_receive=False),
+        )
+
+    assert automate_context.run_status.value == "SUCCEEDED"
+    assert len(stored) == sum(element.category != 46 for element in model.elements)
+
+
+def test_failed_store_build_leaves_no_file(tmp_path, monkeypatch):
+    from main import FunctionInputs, SketchUp_to_Revit
+    from tests.fake_speckle_server import (
+        FakeSpeckleServer,
+        fake_automation_context,
+        generate_model,
+    )
+
+    def disk_full(meshes, path, release=False):
+        with open(path, "wb") as file:
+            file.write(b"\0" * 64)
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(VertexStore, "build", disk_full)
+    with FakeSpeckleServer() as server:
+        version_id = server.add_model(generate_model(20))
+        automate_context = fake_automation_context(server, version_id)
+        SketchUp_to_Revit(
+            automate_context,
+            FunctionInputs(parallel_workers=2, vertex_store_directory=str(tmp_path)),
+        )
+
+    assert automate_context.run_status.value == "FAILED"
+    assert not list(tmp_path.glob("*.vertices"))
@@ -0,0 +1,101 @@
+"""Tests for the element time budget, its geometry fallback and the timing report."""
+
+from time import perf_counter
+
+import pytest
+
+from Converter import convert_wall
+from main import FunctionInputs
+from Watchdog import ElementTimings, long_axis_baseline
+
+
+def test_long_axis_of_rectangle():
+    baseline = long_axis_baseline([(0, 0), (10, 0), (10, 2), (0, 2), (5, 1)])
+
+    assert baseline.length == pytest.approx(10)
+    assert sorted(baseline.coords) == [
+        pytest.approx((0, 1)),
+        pytest.approx((10, 1)),
+    ]
+
+
+def test_long_axis_of_collinear_points():
+    baseline = long_axis_baseline([(0, 0), (3, 3), (1, 1)])
+
+    assert baseline.geom_type == "LineString"
+    assert baseline.length == pytest.approx(3 * 2**0.5)
+
+
+def test_long_axis_of_single_point():
+    with pytest.raises(ValueError):
+        long_axis_baseline([(1, 1), (1, 1)])
+
+
+def test_report_lists_slowest_and_degraded_elements():
+    timings = ElementTimings()
+    timings.record("a", "Walls", vertex_count=8, duration=0.5)
+    timings.record("b", "Walls", vertex_count=900, duration=2.0, degraded=True)
+    timings.record("c", "Columns", vertex_count=8, duration=0.1)
+
+    lines = timings.report(2).splitlines()
+    assert lines[0] == "Slowest 2 element(s):"
+    assert lines[1].startswith("  1. b (Walls, 900 vertices): 2.000 s [degraded]")
+    assert lines[2].startswith("  2. a ")
+    assert lines[3] == "1 element(s) exceeded the time budget and were approximated."
+    assert timings.report(0) == ""
+    assert ElementTimings().report(5) == ""
+
+
+def test_wall_predicted_over_budget_skips_the_centerline():
+    import numpy as np
+    from math import pi
+
+    # Dense curved wall, its centerline takes seconds to compute
+    t = np.linspace(0, pi, 4000)
+    outline = np.r_[
+        np.c_[5000 * np.cos(t), 5000 * np.sin(t)],
+        np.c_[4800 * np.cos(t[::-1]), 4800 * np.sin(t[::-1])],
+    ]
+    vertices = np.r_[
+        np.c_[outline, np.zeros(len(outline))],
+        np.c_[outline, np.full(len(outline), 3000.0)],
+    ]
+    element = {"units": "mm", "name": ""}
+
+    start = perf_counter()
+    result = convert_wall(element, vertices, FunctionInputs(element_time_budget=0.05))
+
+    assert perf_counter() - start < 1.0
+    assert result["degraded"] and not result["errors"]
+    assert len(result["walls"]) == 1
+    comment = result["walls"][0]["parameters"]["ALL_MODEL_INSTANCE_COMMENTS"]["value"]
+    assert "DEGRADED, baseline approximated" in comment
+
+
+def test_first_element_is_not_timed_with_the_imports():
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # A fresh interpreter, so no test imported shapely or pygeoops before
+    script = """
+import numpy as np
+import Converter
+from main import FunctionInputs
+
+wall = {"id": "wall", "category": 107, "name": ""}
+vertices = np.array(
+    [(x, y, z) for z in (0.0, 3000.0) for x, y in ((0, 0), (4000, 0), (4000, 200), (0, 200))]
+)
+print(Converter.convert_element(wall, vertices, FunctionInputs())["duration"])
+"""
+    duration = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()[-1]
+
+    # Importing pygeoops alone takes about 0.5 s, the wall itself milliseconds
+    assert float(duration) < 0.2